@@ -4,10 +4,11 @@ import os
 import platform
 import re
 import string
-import yaml
 from ..core import tasks
+from ..core import utils
 from ..core.engine.task_graph import TaskGraph
 from ..core.engine.resolver import Resolver
+from ..core.tasks.task import freeze
 
 class LoaderException(Exception):
     """ Exception for generic Task errors
@@ -38,6 +39,7 @@ class Loader(object):
 
         self._config_file_paths = config_file_paths
         self.__config = None
+        self.__path_swap_lookup = None
         self.replacements = replacements or {}
         self._sgtk = sgtk
         self.temp_dir = temp_dir
@@ -49,6 +51,51 @@ class Loader(object):
         
         return self.__config
 
+    @property
+    def path_swap_lookup(self):
+        """ Lookup dictionary for swapping paths between operating systems, built 
+            from the path_swap config. Built once, and shared by all the tasks 
+            created by this Loader, so it can not be modified.
+        """
+        if self.__path_swap_lookup is None:
+            self.__path_swap_lookup = self._build_path_swap_lookup(
+                self.config.get("path_swap") or {}
+            )
+
+        return self.__path_swap_lookup
+
+    def _build_path_swap_lookup(self, path_swap):
+        """ The way path swap is configured is not really optimal for performing 
+            the actual path swaps. Lets format this into a lookup dictionary keyed 
+            on all different root paths possible.
+
+            Args:
+                path_swap (dict): The path_swap config. Name => dict of the root 
+                    path(s) for each OS.
+
+            Returns:
+                FrozenDict: Root path => dict of the list of root paths for each OS.
+        """
+        path_swap_lookup = {}
+        for swap in path_swap:
+            # The resolver expects a list of OS paths, rather than a single 
+            # string, so convert them to lists. (Without modifying the config)
+            # We support a list of root paths for each OS because some OS's 
+            # may have multiple root paths which point to the same location. 
+            # Ex: Windows UNC paths vs drive letters.
+            os_paths = {}
+            for os_name, paths in path_swap[swap].items():
+                if isinstance(paths, list):
+                    os_paths[os_name] = list(paths)
+                else:
+                    os_paths[os_name] = [paths]
+
+            for paths in os_paths.values():
+                for path in paths:
+                    path_swap_lookup[path] = os_paths
+
+        return freeze(path_swap_lookup)
+
     def _update_config(self, current_dict, new_dict):
         
         # # Generic solution:
@@ -113,10 +160,10 @@ class Loader(object):
 
     def _load_configs(self, config_file_paths):
         config = {}
-        for config_file in config_file_paths:
 
-            # Replace any replacements in the config file paths.
-            resolver = Resolver(self.replacements, sgtk=self._sgtk)
+        # Replace any replacements in the config file paths.
+        resolver = Resolver(self.replacements, sgtk=self._sgtk)
+        for config_file in config_file_paths:
             config_file = resolver.resolve(config_file)
 
             # Check that the config file exists before loading it.
@@ -124,10 +171,9 @@ class Loader(object):
                 print("Warning: Wolfkrow config file {} was not found.".format(config_file))
                 continue
 
-            with open(config_file, "r") as handle:
-                file_contents = handle.read()
-
-            config_snippet = yaml.load(file_contents, Loader=yaml.Loader)
+            # Parsed config files are cached (in memory and on disk) until they 
+            # are modified, so building many Loaders only parses each file once.
+            config_snippet = utils.load_yaml(config_file)
             self._update_config(config, config_snippet)
 
         # replace replacements
@@ -152,33 +198,13 @@ class Loader(object):
             print("Warning: Task type '{task_type}' is undefined. Ignoring...".format(task_type=task_type))
             return None
 
-        # The way path swap is configured is not really optimal for performing 
-        # the actual path swaps. Lets format this into a lookup dictionary keyed 
-        # on all different root paths possible.
-        path_swap = self.config.get("path_swap", {})
-        path_swap_lookup = {}
-        for swap in path_swap:
-            for os in path_swap[swap]:
-                # We support a list of root paths for each OS because some OS's 
-                # may have multiple root paths which point to the same location. 
-                # Ex: Windows UNC paths vs drive letters.
-                if isinstance(path_swap[swap][os], list):
-                    for path in path_swap[swap][os]:
-                        path_swap_lookup[path] = path_swap[swap]
-                else:
-                    # The resolver expects a list of OS paths, rather than a 
-                    # single string, so convert this to a list.
-                    path_swap[swap][os] = [path_swap[swap][os]]
-
-                    path_swap_lookup[path_swap[swap][os][0]] = path_swap[swap]
-
         task_data['name'] = task_name
         task_data['config'] = self.config
         task = task_obj.from_dict(
             task_data, 
             replacements=self.replacements,
             resolver_search_paths=self.config.get("resolver_search_paths", []),
-            path_swap_lookup=path_swap_lookup,
+            path_swap_lookup=self.path_swap_lookup,
             config_files=self._config_file_paths, 
             temp_dir=self.temp_dir,
             sgtk=self._sgtk
@@ -0,0 +1,129 @@
+""" job_manifest Module for writing the args of many exported tasks to a single file.
+
+    Exporting a task normally writes its args to its own JSON file, which means
+    a large TaskGraph (Especially one with chunked sequence tasks) creates
+    hundreds of small files on shared storage. Instead, a JobManifest can be
+    used to write the args of every task in the TaskGraph to a single JSONL
+    file, with each command referencing its record by ID.
+
+    The ID of a record is the byte offset of the record in the manifest, so
+    reading a single record only requires a seek, rather than parsing the
+    whole manifest.
+"""
+
+from builtins import object
+import json
+import os
+import threading
+
+
+class JobManifestException(Exception):
+    """ Exception for errors reading or writing a JobManifest.
+    """
+    pass
+
+
+class JobManifest(object):
+    """ JSONL file containing a record for each exported task. Each record has
+        the "id", "task_name" and "task_args" of the task.
+
+        Records can be added from multiple threads at once. The file is only
+        created once the first record is added.
+    """
+
+    def __init__(self, file_path):
+        """ Initializes the JobManifest object.
+
+            Args:
+                file_path (str): Path to write the manifest to.
+        """
+        self.file_path = file_path
+        self.record_count = 0
+        self._handle = None
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    def add_record(self, task_name, task_args):
+        """ Appends a record for a task to the manifest.
+
+            Args:
+                task_name (str): Class name of the task.
+                task_args (dict): Args to construct the task with.
+
+            Returns:
+                int: ID of the record, to pass to `wolfkrow_run_task --manifest_record`.
+        """
+        with self._lock:
+            if self._handle is None:
+                directory = os.path.dirname(self.file_path)
+                if directory and not os.path.exists(directory):
+                    os.makedirs(directory)
+                self._handle = open(self.file_path, "wb")
+
+            record_id = self._offset
+            record = {"id": record_id, "task_name": task_name, "task_args": task_args}
+            line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+            data = line.encode("utf-8")
+
+            self._handle.write(data)
+            self._offset += len(data)
+            self.record_count += 1
+
+        return record_id
+
+    def close(self):
+        """ Finishes writing the manifest. Must be called before any of the
+            records are read.
+        """
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def read_record(file_path, record_id):
+        """ Reads a single record from a manifest file.
+
+            Args:
+                file_path (str): Path to the manifest file.
+                record_id (int): ID of the record to read.
+
+            Returns:
+                dict: The record, containing the "id", "task_name", and "task_args".
+
+            Raises:
+                JobManifestException: The record could not be read.
+        """
+        try:
+            offset = int(record_id)
+        except (TypeError, ValueError):
+            raise JobManifestException("Invalid manifest record ID: %s" % record_id)
+
+        try:
+            with open(file_path, "rb") as handle:
+                handle.seek(offset)
+                line = handle.readline()
+        except (IOError, OSError) as exception:
+            raise JobManifestException(
+                "Couldn't read manifest file: %s - %s" % (file_path, exception)
+            )
+
+        try:
+            record = json.loads(line.decode("utf-8"))
+        except ValueError:
+            record = None
+
+        # The record must start exactly at the offset, otherwise we have been
+        # given an ID which does not exist.
+        if not isinstance(record, dict) or record.get("id") != offset:
+            raise JobManifestException(
+                "No record with ID %s in manifest file: %s" % (record_id, file_path)
+            )
+
+        return record
@@ -0,0 +1,285 @@
+""" local_scheduler Module for running a graph of jobs concurrently on the local machine.
+"""
+
+from builtins import object
+import asyncio
+import collections
+import logging
+import os
+
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+class ResourcePool(object):
+    """ Tracks the resources available for running jobs on the local machine. 
+        (Ex: CPU cores, memory, licence tokens.)
+
+        Resources which have no capacity configured are treated as unlimited.
+    """
+
+    def __init__(self, capacity=None):
+        """ Initializes the ResourcePool object.
+
+            Kwargs:
+                capacity (dict): Resource name => amount available.
+        """
+        self.capacity = {}
+        for resource, amount in (capacity or {}).items():
+            if amount is not None:
+                self.capacity[resource] = float(amount)
+
+        self._in_use = collections.defaultdict(float)
+
+    def normalize(self, name, requested):
+        """ Converts the requested resources into the form used by the pool.
+
+            Requests larger than the total capacity can never be satisfied, so 
+            they are reduced to the total capacity, meaning the job will simply 
+            require the resource all to itself.
+
+            Args:
+                name (str): Name of the job requesting the resources. Only used 
+                    for the warning message.
+                requested (dict): Resource name => amount required.
+
+            Returns:
+                dict: Resource name => amount required. Unlimited resources are removed.
+        """
+        normalized = {}
+        for resource, amount in (requested or {}).items():
+            if resource not in self.capacity or amount is None:
+                continue
+
+            amount = float(amount)
+            if amount > self.capacity[resource]:
+                logging.warning("Task '%s' requires %s '%s', but only %s is available. "
+                    "It will run using all of it." % (name, amount, resource, self.capacity[resource]))
+                amount = self.capacity[resource]
+
+            normalized[resource] = amount
+
+        return normalized
+
+    def fits(self, requested):
+        """ Returns whether or not the requested resources are currently available. """
+        for resource, amount in requested.items():
+            if self._in_use[resource] + amount > self.capacity[resource]:
+                return False
+        return True
+
+    def acquire(self, requested):
+        """ Marks the requested resources as in use. """
+        for resource, amount in requested.items():
+            self._in_use[resource] += amount
+
+    def release(self, requested):
+        """ Returns previously acquired resources to the pool. """
+        for resource, amount in requested.items():
+            self._in_use[resource] -= amount
+
+
+class LocalScheduler(object):
+    """ Ready-queue scheduler which launches every job whose dependencies have
+        successfully completed, using a bounded pool of worker threads.
+
+        Each job is a callable which returns True on success and False on failure.
+        Jobs which depend on a failed (or skipped) job are skipped.
+
+        Jobs can also declare the resources they need, in which case they are 
+        only started once those resources are available in the ResourcePool.
+
+        Jobs are either run on a pool of threads (See run), or as coroutines on 
+        an asyncio event loop (See run_async).
+    """
+
+    def __init__(self, max_workers=None, resources=None):
+        """ Initializes the LocalScheduler object.
+
+            Kwargs:
+                max_workers (int): The maximum number of jobs to run at once.
+                    Defaults to the number of CPUs on this machine.
+                resources (dict): Resource name => amount available for running 
+                    jobs. Resources not specified are unlimited.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.resource_pool = ResourcePool(resources)
+        self._jobs = collections.OrderedDict()
+        self._job_resources = {}
+
+    def add_job(self, name, runnable, dependencies=None, resources=None):
+        """ Adds a job to the scheduler.
+
+            Args:
+                name (str): Unique name of the job.
+                runnable (callable): Callable which does the work. Must return
+                    True if successful, otherwise False.
+
+            Kwargs:
+                dependencies (list): Names of the jobs which must successfully
+                    complete before this job can start. Dependencies which were
+                    never added to the scheduler are ignored.
+                resources (dict): Resource name => amount this job requires 
+                    while it is running.
+        """
+        self._jobs[name] = (runnable, list(dependencies or []))
+        self._job_resources[name] = self.resource_pool.normalize(name, resources)
+
+    def run(self):
+        """ Runs all the jobs, and blocks until they have all finished.
+
+            Returns:
+                dict: Job name => True if the job succeeded, False if it failed,
+                    or None if it was skipped.
+        """
+        self._reset()
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while self._ready or running:
+                for name in self._pop_startable_jobs(len(running)):
+                    future = executor.submit(self._run_job, name)
+                    running[future] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    self._finish_job(name, future.result())
+
+        return self._collect_results()
+
+    async def run_async(self):
+        """ Coroutine version of run. Jobs must be coroutine functions, and are 
+            run concurrently on the current event loop instead of on threads.
+
+            Returns:
+                dict: Job name => True if the job succeeded, False if it failed,
+                    or None if it was skipped.
+        """
+        self._reset()
+        running = {}
+
+        while self._ready or running:
+            for name in self._pop_startable_jobs(len(running)):
+                future = asyncio.ensure_future(self._run_job_async(name))
+                running[future] = name
+
+            done, _ = await asyncio.wait(set(running), return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                self._finish_job(name, future.result())
+
+        return self._collect_results()
+
+    def _reset(self):
+        """ Builds the lookups of which jobs each job is waiting on, and which 
+            jobs are waiting on it. Only tracks dependencies on jobs which actually 
+            exist.
+        """
+        self._results = {}
+        self._waiting_on = {}
+        self._dependents = collections.defaultdict(list)
+        for name, (runnable, dependencies) in self._jobs.items():
+            dependencies = set(
+                dependency for dependency in dependencies
+                if dependency in self._jobs and dependency != name
+            )
+            self._waiting_on[name] = dependencies
+            for dependency in dependencies:
+                self._dependents[dependency].append(name)
+
+        self._ready = [name for name in self._jobs if not self._waiting_on[name]]
+
+    def _pop_startable_jobs(self, running_count):
+        """ Removes every ready job which fits in the available resources from 
+            the ready queue, and acquires its resources.
+
+            Jobs are considered in the order they became ready, but a job which 
+            does not fit will not block smaller jobs behind it.
+
+            Args:
+                running_count (int): Number of jobs which are currently running.
+
+            Returns:
+                list: Names of the jobs to start.
+        """
+        startable = []
+        for name in list(self._ready):
+            if running_count + len(startable) >= self.max_workers:
+                break
+
+            job_resources = self._job_resources[name]
+            if not self.resource_pool.fits(job_resources):
+                continue
+
+            self._ready.remove(name)
+            self.resource_pool.acquire(job_resources)
+            logging.info("Running task: %s" % name)
+            startable.append(name)
+
+        return startable
+
+    def _finish_job(self, name, success):
+        """ Records the result of a job, releases its resources, and queues up 
+            (or skips) the jobs waiting on it.
+        """
+        self.resource_pool.release(self._job_resources[name])
+        self._results[name] = success
+
+        if not success:
+            self._skip_dependents(name)
+            return
+
+        for dependent in self._dependents[name]:
+            self._waiting_on[dependent].discard(name)
+            if not self._waiting_on[dependent] and dependent not in self._results:
+                self._ready.append(dependent)
+
+    def _collect_results(self):
+        # Anything left over was never able to run. This only happens when there
+        # are circular dependencies.
+        for name in self._jobs:
+            if name not in self._results:
+                logging.error("Task '%s' was never run because of circular dependencies." % name)
+                self._results[name] = None
+
+        return self._results
+
+    def _run_job(self, name):
+        runnable = self._jobs[name][0]
+        try:
+            success = bool(runnable())
+        except Exception as e:
+            logging.exception("Task '%s' raised an exception: %s" % (name, e))
+            success = False
+
+        self._log_result(name, success)
+        return success
+
+    async def _run_job_async(self, name):
+        runnable = self._jobs[name][0]
+        try:
+            success = bool(await runnable())
+        except Exception as e:
+            logging.exception("Task '%s' raised an exception: %s" % (name, e))
+            success = False
+
+        self._log_result(name, success)
+        return success
+
+    def _log_result(self, name, success):
+        if success:
+            logging.info("Task '%s' Successfully completed" % name)
+        else:
+            logging.error("Task '%s' Failed. Will skip all dependant tasks." % name)
+
+    def _skip_dependents(self, name):
+        """ Recursively marks all the dependents of the given job as skipped. """
+        pending = list(self._dependents[name])
+        while pending:
+            dependent = pending.pop()
+            if dependent in self._results:
+                continue
+
+            logging.warning("This task's dependencies failed to execute. Skipping task: '%s'" % dependent)
+            self._results[dependent] = None
+            pending.extend(self._dependents[dependent])
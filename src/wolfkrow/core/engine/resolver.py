@@ -3,15 +3,415 @@ from builtins import range
 from builtins import object
 from past.builtins import basestring
 
+import collections
 import copy
 import datetime
+import functools
+import json
 import os
 import platform
 import re
 import string
+import time
 
 from string import Formatter
 
+from wolfkrow.core import utils
+
+# Resolved replacements shared between all Resolvers. Tasks created from the same
+# workflow all have the same replacements, so this saves resolving them again 
+# for every Task. (See Resolver._get_resolved_replacements)
+_resolved_replacements_cache = utils.LRUCache(maxsize=256)
+
+class PathCache(object):
+    """ Caches which paths exist, for a limited amount of time. Used by the 
+        Resolver so that the same search paths are not checked on disk over and 
+        over again. (See Resolver._resolve_prefix)
+
+        Paths which do not exist are only cached for a short time, so a path is 
+        found soon after it is created. Long running processes which run many 
+        tasks should clear the cache between tasks, so that the outputs of 
+        earlier tasks are found straight away. (See Resolver.clear_path_cache)
+
+        Configured with the following environment variables, which are read 
+        when the cache is created:
+            WOLFKROW_RESOLVER_PATH_CACHE_TTL: Number of seconds to cache the 
+                paths which exist for. Defaults to 30. Set to 0 to disable the 
+                cache.
+            WOLFKROW_RESOLVER_PATH_CACHE_NEGATIVE_TTL: Number of seconds to cache 
+                the paths which do not exist for. Defaults to 5.
+            WOLFKROW_RESOLVER_PRESCAN: If enabled ("1"), the parent directory of 
+                each path is listed with a single os.scandir call, and all the 
+                paths in that directory are checked using that listing.
+    """
+
+    DEFAULT_TTL = 30
+    DEFAULT_NEGATIVE_TTL = 5
+
+    def __init__(self, maxsize=10000, ttl=None, negative_ttl=None, prescan=None):
+        """ Initializes the PathCache object. 
+
+            Kwargs:
+                maxsize (int): Maximum number of paths to cache.
+                ttl (float): Number of seconds to cache the paths which exist for.
+                negative_ttl (float): Number of seconds to cache the paths which 
+                    do not exist for.
+                prescan (bool): Whether or not to check paths using the listing 
+                    of their parent directory.
+
+            Any of the kwargs which are not specified are read from the 
+            environment. (See above)
+        """
+        self._exists = utils.LRUCache(maxsize=maxsize)
+        self._listings = utils.LRUCache(maxsize=maxsize // 10)
+
+        if ttl is None:
+            ttl = self._get_seconds("WOLFKROW_RESOLVER_PATH_CACHE_TTL", self.DEFAULT_TTL)
+        if negative_ttl is None:
+            negative_ttl = self._get_seconds("WOLFKROW_RESOLVER_PATH_CACHE_NEGATIVE_TTL", self.DEFAULT_NEGATIVE_TTL)
+        if prescan is None:
+            prescan = os.environ.get("WOLFKROW_RESOLVER_PRESCAN", "0").lower() in ("1", "true", "yes")
+
+        self.ttl = ttl
+        self.negative_ttl = min(negative_ttl, ttl)
+        self.prescan = prescan
+
+    @staticmethod
+    def _get_seconds(name, default):
+        try:
+            return float(os.environ.get(name, default))
+        except ValueError:
+            return default
+
+    def exists(self, path):
+        """ Cached version of os.path.exists. """
+        if self.ttl <= 0:
+            return os.path.exists(path)
+
+        now = time.monotonic()
+        cached = self._exists.get(path)
+        if cached is not None:
+            exists, checked = cached
+            if now - checked < (self.ttl if exists else self.negative_ttl):
+                return exists
+
+        exists = None
+        if self.prescan:
+            exists = self._exists_from_listing(path, now)
+
+        if exists is None:
+            exists = os.path.exists(path)
+
+        if exists or self.negative_ttl > 0:
+            self._exists.set(path, (exists, now))
+        return exists
+
+    def _exists_from_listing(self, path, now):
+        """ Checks whether the path exists using the listing of its parent 
+            directory.
+
+            Returns:
+                bool: Whether or not the path exists, or None if it could not be 
+                    determined from the listing.
+        """
+        parent, name = os.path.split(path)
+        if not name:
+            return None
+
+        cached = self._listings.get(parent)
+        if cached is not None and now - cached[1] < self.ttl:
+            listing, listed = cached
+        else:
+            listing = {}
+            try:
+                for entry in os.scandir(parent or "."):
+                    listing[entry.name] = entry.is_symlink()
+            except OSError:
+                return None
+            listed = now
+            self._listings.set(parent, (listing, listed))
+
+        # Paths which do not exist are only cached for a short time, so the 
+        # listing can only say the path is missing until then.
+        if name not in listing:
+            if now - listed < self.negative_ttl:
+                return False
+            return None
+
+        # A symlink may be broken, so it still needs to be checked.
+        if listing[name]:
+            return None
+
+        return True
+
+    def clear(self):
+        self._exists.clear()
+        self._listings.clear()
+
+    def info(self):
+        """ Returns the hits, misses, maxsize and current size of the cache. """
+        return self._exists.info()
+
+
+# Path existence cache shared between all Resolvers.
+_path_cache = PathCache()
+
+# The current operating system. (Used for path swapping)
+SYSTEM = platform.system().lower()
+
+# Compiled path swap tables, keyed on the contents of the path swap lookup. 
+# (See PathSwapTable.get)
+_path_swap_table_cache = utils.LRUCache(maxsize=64)
+_MISSING = object()
+
+
+class PathSwapTable(object):
+    """ Compiled version of a path swap lookup, which swaps all the paths in a 
+        value in a single pass.
+
+        The path swap lookup maps each path to a dict of the equivalent paths on 
+        each operating system. Ex: 
+            {
+                "/mnt/shows": {"linux": ["/mnt/shows"], "windows": ["S:", "//server/shows"]},
+                "S:": {"linux": ["/mnt/shows"], "windows": ["S:", "//server/shows"]},
+                "//server/shows": {"linux": ["/mnt/shows"], "windows": ["S:", "//server/shows"]},
+            }
+
+        Paths are swapped to the first path in the list for the current operating
+        system. Paths which are already valid for the current operating system 
+        are left as is.
+
+        Paths are only swapped on path boundaries. Meaning "/mnt/shows" will not 
+        be swapped in "/mnt/shows2" or "/data/mnt/shows". When multiple paths 
+        match, the longest one wins.
+    """
+
+    def __init__(self, swaps):
+        """ Initializes the PathSwapTable object. (See compile)
+
+            Args:
+                swaps (dict): Path to swap => path to swap it to.
+        """
+        self.swaps = swaps
+
+        patterns = []
+        # Longest first, so that the longest path wins when multiple paths match.
+        for swap_path in sorted(swaps, key=len, reverse=True):
+            pattern = re.escape(swap_path)
+            if swap_path[-1:] not in ("/", "\\"):
+                # The path must end on a path boundary.
+                pattern += r"(?![\w.\-])"
+            patterns.append(pattern)
+
+        # The path must also start on a path boundary.
+        self.regex = re.compile(r"(?<![\w.\-])(?:" + "|".join(patterns) + ")")
+
+    @classmethod
+    def get(cls, path_swap_lookup):
+        """ Returns the compiled table for the path swap lookup, for the current 
+            operating system. Tables are cached based on the contents of the 
+            lookup, so resolvers with the same lookup share the same table.
+
+            Args:
+                path_swap_lookup (dict): Path => dict of the equivalent paths for 
+                    each operating system.
+
+            Returns:
+                PathSwapTable: The compiled table, or None if there is nothing to swap.
+        """
+        if not path_swap_lookup:
+            return None
+
+        try:
+            cache_key = json.dumps(path_swap_lookup, sort_keys=True)
+        except (TypeError, ValueError):
+            return cls.compile(path_swap_lookup)
+
+        table = _path_swap_table_cache.get(cache_key, _MISSING)
+        if table is _MISSING:
+            table = cls.compile(path_swap_lookup)
+            _path_swap_table_cache.set(cache_key, table)
+
+        return table
+
+    @classmethod
+    def compile(cls, path_swap_lookup, system=None):
+        """ Compiles the path swap lookup for the given operating system.
+
+            Args:
+                path_swap_lookup (dict): Path => dict of the equivalent paths for 
+                    each operating system.
+
+            Kwargs:
+                system (str): Name of the operating system, as returned by 
+                    platform.system(). Defaults to the current operating system.
+
+            Returns:
+                PathSwapTable: The compiled table, or None if there is nothing to swap.
+        """
+        system = (system or SYSTEM).lower()
+
+        swaps = {}
+        for swap_path, os_paths in (path_swap_lookup or {}).items():
+            # We use the first path in the list of paths for the current OS.
+            # This is important so that the user can configure a consistent 
+            # default which paths get mapped to.
+            current_os_path_options = os_paths.get(system)
+            if not swap_path or not current_os_path_options:
+                continue
+
+            # Only perform the swap if the root path is not already a valid path 
+            # for this OS
+            if swap_path not in current_os_path_options:
+                swaps[swap_path] = current_os_path_options[0]
+
+        if not swaps:
+            return None
+
+        return cls(swaps)
+
+    def swap(self, value):
+        """ Swaps all the paths in the value. """
+        return self.regex.sub(self._replace, value)
+
+    def _replace(self, match):
+        return self.swaps[match.group(0)]
+
+_FIELD_ROOT_REGEX = re.compile(r"[.\[]")
+_IDENTIFIER_REGEX = re.compile(r"^[^\d\W]\w*$")
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_template(format_string):
+    """ Parses a format string into a tuple of (literal_text, field_name, 
+        format_spec, conversion) tuples. (See string.Formatter.parse)
+
+        The same strings are parsed over and over again, so the results are cached.
+    """
+    return tuple(Formatter().parse(format_string))
+
+
+def _get_field_root(field_name):
+    """ Returns the name of the argument a field refers to. 
+        Ex: "foo.bar[0]" => "foo"
+    """
+    return _FIELD_ROOT_REGEX.split(field_name, 1)[0]
+
+
+def _has_environment_variables(value):
+    """ Quick check for whether os.path.expandvars could change the value. """
+    return "$" in value or (os.name == "nt" and "%" in value)
+
+
+def _copy_replacements(replacements):
+    """ Copies a dict of resolved replacements. Only the lists and dicts in it 
+        are deep copied, since the other values can not be modified in place.
+    """
+    return dict(
+        (name, copy.deepcopy(value) if isinstance(value, (dict, list)) else value)
+        for name, value in replacements.items()
+    )
+
+
+class _Template(object):
+    """ A string which has been pre-processed for replacing replacements. 
+
+        The date tokens have been replaced, and the string has been split into 
+        literal text and fields, so that replacing the replacements is just a 
+        matter of joining the parts back together.
+    """
+
+    def __init__(self, text, parts, simple):
+        """ Initializes the _Template object. (See _compile_template)
+
+            Args:
+                text (str): The string with the date tokens replaced.
+                parts (tuple): Parsed (literal_text, field_name, format_spec, conversion) 
+                    tuples, or None if the string has no fields.
+                simple (bool): Whether or not all the fields are plain names, 
+                    with no nested fields in their format spec.
+        """
+        self.text = text
+        self.parts = parts
+        self.simple = simple
+
+    def render(self, replacements):
+        """ Replaces the fields in the template with the given replacements. 
+            Fields which are not in the replacements are kept as is.
+        """
+        if self.parts is None:
+            return self.text
+
+        if not self.simple:
+            return _FORMATTER.vformat(self.text, (), replacements)
+
+        result = []
+        for literal_text, field_name, format_spec, conversion in self.parts:
+            if literal_text:
+                result.append(literal_text)
+
+            if field_name is None:
+                continue
+
+            if field_name not in replacements:
+                # Keep the field as is. (See WolfkrowFormatter._vformat)
+                obj = "{" + field_name
+                if format_spec:
+                    obj += ":" + format_spec
+                if conversion:
+                    obj += conversion
+                result.append(obj + "}")
+                continue
+
+            obj = _FORMATTER.convert_field(replacements[field_name], conversion)
+            result.append(_FORMATTER.format_field(obj, format_spec))
+
+        return "".join(result)
+
+
+@functools.lru_cache(maxsize=4096)
+def _compile_template(value, time):
+    """ Pre-processes a string for replacing replacements. (See _Template)
+
+        Args:
+            value (str): The string, with its environment variables expanded.
+            time (datetime): The time to use for the date tokens.
+
+        Returns:
+            _Template: The compiled template.
+
+        Raises:
+            ValueError: If the string is not a valid format string.
+    """
+
+    # Replace any date tokens.
+    if "DATE<" in value:
+        for match in Resolver.DATETIME_PATTERN.findall(value):
+            date_format = match[1]
+            sub = "DATE<{}>".format(date_format)
+            try:
+                date_value = time.strftime(date_format)
+            except ValueError:
+                print("Error: Could not format date with format: {}".format(date_format))
+                print("See pythons's dattime documentation for valid date formats.")
+                date_value = sub
+            value = value.replace(sub, date_value)
+
+    if "{" not in value and "}" not in value:
+        return _Template(value, None, True)
+
+    parts = _parse_template(value)
+    simple = True
+    for _, field_name, format_spec, _ in parts:
+        if field_name is None:
+            continue
+        if not _IDENTIFIER_REGEX.match(field_name) or (format_spec and "{" in format_spec):
+            simple = False
+            break
+
+    return _Template(value, parts, simple)
+
+
 class WolfkrowFormatter(Formatter):
     def _vformat(self, format_string, args, kwargs, used_args, recursion_depth, auto_arg_index=0):
         """
@@ -87,11 +487,21 @@ class WolfkrowFormatter(Formatter):
 
         return ''.join(result), auto_arg_index
 
+    def parse(self, format_string):
+        # The same strings are parsed over and over again, so use the cached version.
+        return _parse_template(format_string)
+
+
+# All the formatting state lives in the arguments, so a single formatter can be shared.
+_FORMATTER = WolfkrowFormatter()
+
 class Resolver(object):
 
     RESOLVER_TOKEN = "#resolver"
     SGTK_TEMPLATE_REGEX = "(SGTKTEMPLATE<)(.*?)(>)"
     DATETIME_REGEX = "(DATE<)(.*?)(>)"
+    SGTK_TEMPLATE_PATTERN = re.compile(SGTK_TEMPLATE_REGEX)
+    DATETIME_PATTERN = re.compile(DATETIME_REGEX)
 
     # We want to store the current time once, so that all date tokens are using the exact same time
     TIME = datetime.datetime.now()
@@ -110,7 +520,13 @@ class Resolver(object):
             sgtk: Optional Shotgun toolkit instance to allow the use of templates.
         """
         self.path_swap_lookup = path_swap_lookup or {}
+        self.path_swap_table = PathSwapTable.get(self.path_swap_lookup)
         self.sgtk = sgtk
+        self.resolved_replacements = {}
+
+        # Incremented whenever the resolved replacements change, so that values 
+        # resolved with this resolver can be cached until then.
+        self.generation = 0
         self.resolver_token = resolver_token
 
         # Store a reference to the original replacements dict, so any updates are 
@@ -127,10 +543,9 @@ class Resolver(object):
         for search_path in search_paths or []:
             self.search_paths.append(self._os_path_swap(search_path))
 
-        # TODO: We get lots of resolvers defined, and so we need to resolve all the
-        #   same replacements many times... We should try to optimize this because 
-        #   wolfkrow is noticeably slower than it should be.
-        self.resolved_replacements = self.resolve_replacements(self._replacements)
+        # We get lots of resolvers defined with the same replacements, so the 
+        # resolved replacements are shared between them.
+        self.resolved_replacements = self._get_resolved_replacements(self._replacements)
 
     def refresh_replacements(self, replacements=None):
         """ Refreshes the replacements dict. This is useful if you want to update 
@@ -146,36 +561,209 @@ class Resolver(object):
         if replacements:
             self._replacements = replacements
 
-        self.resolved_replacements = self.resolve_replacements(self._replacements)
+        self.resolved_replacements = self._get_resolved_replacements(self._replacements)
+        self.generation += 1
+
+    def is_cacheable(self, value):
+        """ Returns whether or not the resolved value only depends on the 
+            replacements, and so can be cached until they change.
+
+            Values using the resolver token depend on which paths exist on disk, 
+            and values using environment variables depend on the environment, 
+            so both need to be resolved again every time.
+
+            Args:
+                value (str, dict or list): The value before it is resolved.
+        """
+        if isinstance(value, dict):
+            return all(self.is_cacheable(dict_value) for dict_value in value.values())
+
+        elif isinstance(value, list):
+            return all(self.is_cacheable(list_value) for list_value in value)
+
+        elif isinstance(value, basestring):
+            return self.resolver_token not in value and not _has_environment_variables(value)
+
+        return True
+
+    def copy(self, replacements):
+        """ Creates a copy of this resolver which uses the given replacements. 
+
+            The replacements must currently be the same as this resolvers 
+            replacements, which allows the copy to skip resolving them again.
+
+            Args:
+                replacements (dict): The replacements for the copy to use. 
+        """
+        other = copy.copy(self)
+        other._replacements = replacements
+        other.resolved_replacements = _copy_replacements(self.resolved_replacements)
+        return other
+
+    @classmethod
+    def cache_info(cls):
+        """ Returns the hits, misses, maxsize and current size of the resolved 
+            replacements cache shared between all Resolvers.
+        """
+        return _resolved_replacements_cache.info()
+
+    @classmethod
+    def path_cache_info(cls):
+        """ Returns the hits, misses, maxsize and current size of the path 
+            existence cache shared between all Resolvers. (See PathCache)
+        """
+        return _path_cache.info()
+
+    @classmethod
+    def clear_cache(cls):
+        """ Clears the resolved replacements and path existence caches shared 
+            between all Resolvers.
+        """
+        _resolved_replacements_cache.clear()
+        _path_cache.clear()
+
+    @classmethod
+    def clear_path_cache(cls):
+        """ Clears the path existence cache shared between all Resolvers. 
+
+            Long running processes which run many tasks should call this between 
+            tasks, so that paths created by earlier tasks are found straight away.
+        """
+        _path_cache.clear()
+
+    def _get_resolved_replacements(self, replacements):
+        """ Returns the resolved replacements, from the shared cache if possible. 
+            (See resolve_replacements)
+
+            The cache is keyed on everything which affects the result: The 
+            replacements, search paths, path swap lookup, and the environment 
+            (Only if the replacements use environment variables).
+
+            Replacements are not cached when they use the resolver token, since 
+            the result depends on which paths exist on disk, or when there is 
+            an sgtk instance, since the result depends on its templates.
+        """
+        if self.sgtk is not None:
+            return self.resolve_replacements(replacements)
+
+        try:
+            replacements_json = json.dumps(replacements, sort_keys=True, default=repr)
+            fingerprint = json.dumps(
+                [replacements_json, self.search_paths, self.path_swap_lookup, self.resolver_token],
+                sort_keys=True, 
+                default=repr
+            )
+        except (TypeError, ValueError):
+            # Can't fingerprint the replacements, so don't cache them.
+            return self.resolve_replacements(replacements)
+
+        if self.resolver_token in replacements_json:
+            return self.resolve_replacements(replacements)
+
+        # Hashing the environment is relatively expensive, so only do it when needed.
+        environment_hash = None
+        if _has_environment_variables(fingerprint):
+            environment_hash = hash(frozenset(os.environ.items()))
+
+        cache_key = (fingerprint, environment_hash)
+
+        resolved_replacements = _resolved_replacements_cache.get(cache_key)
+        if resolved_replacements is None:
+            resolved_replacements = self.resolve_replacements(replacements)
+            _resolved_replacements_cache.set(cache_key, resolved_replacements)
+
+        # Return a copy so that the cached replacements can not be modified.
+        return _copy_replacements(resolved_replacements)
 
     def resolve_replacements(self, replacements):
-        """ Iterates through the replacements dict and resolves any replacements 
-            that are within other replacements.
-
-            NOTE: This is not a recursive function, so there is no risk of an infinite 
-                replacements loop. eg: foo = "{bar}", bar = "{foo}". 
-                If such a case exists, you will not get an error, the looped 
-                replacement will simply not be resolved. The final unreplaced 
-                replacement will change depending on the order that the replacements 
-                are iterated through.
+        """ Resolves any replacements that are within other replacements.
+
+            Each replacement is parsed once to find the other replacements it 
+            references, and then the replacements are resolved in dependency 
+            order, so every replacement is only resolved once.
+
+            NOTE: There is no risk of an infinite replacements loop. 
+                eg: foo = "{bar}", bar = "{foo}". If such a case exists, a warning 
+                is printed, and the looped references are simply left unresolved.
         """
 
         # First we copy the replacements so that we can modify them without affecting the original.
         replacements = copy.deepcopy(replacements)
 
-        # For each replacement, we iterate through all other replacements and resolve it.
-        for replacement in replacements:
-            # Get the current replacement
-            single_replacement = {replacement: replacements[replacement]}
+        # Build the dependency graph between the replacements.
+        dependencies = {}
+        dependents = collections.defaultdict(list)
+        for name, value in replacements.items():
+            referenced = self._get_referenced_fields(value)
+            referenced.discard(name)
+            dependencies[name] = set(
+                reference for reference in referenced if reference in replacements
+            )
+            for dependency in dependencies[name]:
+                dependents[dependency].append(name)
+
+        # Resolve the replacements in topological order.
+        resolved = {}
+        ready = collections.deque(name for name in replacements if not dependencies[name])
+        while ready:
+            name = ready.popleft()
+            resolved[name] = self.resolve(replacements[name], replacements=resolved)
+
+            for dependent in dependents[name]:
+                dependencies[dependent].discard(name)
+                if not dependencies[dependent]:
+                    ready.append(dependent)
+
+        # Anything left over references itself, is part of a loop, or depends 
+        # on a replacement which is. Resolve what we can, and leave the rest.
+        unresolved = [name for name in replacements if name not in resolved]
+        if unresolved:
+            print("Warning: Could not fully resolve replacements because of circular references: {}".format(
+                ", ".join(unresolved)))
+        acyclic = dict(resolved)
+        for name in unresolved:
+            resolved[name] = self.resolve(replacements[name], replacements=acyclic)
+
+        # Preserve the original ordering of the replacements.
+        return dict((name, resolved[name]) for name in replacements)
+
+    def _get_referenced_fields(self, value):
+        """ Returns the names of all the replacements referenced by the value.
+            Recurses into dicts and lists.
+
+            Args:
+                value (any): The value to search.
+
+            Returns:
+                set: The referenced replacement names.
+        """
+        referenced = set()
+        if isinstance(value, dict):
+            for dict_value in value.values():
+                referenced.update(self._get_referenced_fields(dict_value))
+
+        elif isinstance(value, list):
+            for list_value in value:
+                referenced.update(self._get_referenced_fields(list_value))
+
+        elif isinstance(value, basestring):
+            # Environment variables are expanded before the replacements are 
+            # replaced, so they may be used in a replacements name.
+            pending = [os.path.expandvars(value)]
+            while pending:
+                try:
+                    parsed = _parse_template(pending.pop())
+                except ValueError:
+                    # Not a valid format string. Nothing will be replaced in it.
+                    continue
 
-            # Now iterate through all the other replacements and resolve it.
-            for replacement_b in replacements:
-                replacements[replacement_b] = self.resolve(
-                    replacements[replacement_b], 
-                    replacements=single_replacement
-                )
+                for _, field_name, format_spec, _ in parsed:
+                    if field_name:
+                        referenced.add(_get_field_root(field_name))
+                    if format_spec:
+                        pending.append(format_spec)
 
-        return replacements
+        return referenced
 
     def resolve(self, value, replacements=None):
         """
@@ -232,7 +820,7 @@ class Resolver(object):
 
         # Strip the resolver token from the path. Also strip the leading slash if present.
         path_postfix = path[len(self.resolver_token):]
-        if path_postfix.startswith(os.path.sep) or path_postfix.startswith(os.path.altsep):
+        if path_postfix[:1] in (os.path.sep, os.path.altsep):
             path_postfix = path_postfix[1:]
 
         searched_paths = []
@@ -245,8 +833,9 @@ class Resolver(object):
             search_path = self._replace_replacements(resolved_path, replacements=replacements)
 
             searched_paths.append(search_path)
-            # See if we resolved to a path that exists.
-            if os.path.exists(search_path):
+            # See if we resolved to a path that exists. The same search paths 
+            # are checked over and over again, so the result is cached.
+            if _path_cache.exists(search_path):
                 return search_path
 
         # No valid path was found. Return the original path, and print a warning.
@@ -263,35 +852,32 @@ class Resolver(object):
         # Doing this first allows us to set environment variables inside of a replacement
         # name which will allow for some neat use cases. Such as setting the name of the
         # replacement you want to use in the environment. IE: {$MY_REPLACEMENT_NAME_FROM_ENV}
-        value = os.path.expandvars(value)
+        if _has_environment_variables(value):
+            value = os.path.expandvars(value)
 
-        # Next, replace any date tokens.
-        date_regexp = self.DATETIME_REGEX
-        matches = re.findall(date_regexp, value)
-        for match in matches:
-            date_format = match[1]
-            sub = "DATE<{}>".format(date_format)
-            try:
-                date_value = self.TIME.strftime(date_format)
-            except ValueError:
-                print("Error: Could not format date with format: {}".format(date_format))
-                print("See pythons's dattime documentation for valid date formats.")
-                date_value = sub
-            value = value.replace(sub, date_value)
+        # Next, replace any date tokens, and split the value into its fields.
+        try:
+            template = _compile_template(value, self.TIME)
+        except ValueError:
+            template = None
 
-        replacements = replacements or self.resolved_replacements
+        if replacements is None:
+            replacements = self.resolved_replacements
 
         # If there are no replacements passed in, then there is nothing left to do.
         # This is useful in cases where we don't have replacements, but still want to 
         # do environment variable  or date expansion.
         if replacements is None:
-            return value
+            return template.text if template else value
 
         # Replace the replacements following the regular string format syntax ("{name}").
         # Note: Replacing these replacements first, allows you to use a replacement 
         # in the name of a SGTK template.
         try:
-            value = WolfkrowFormatter().vformat(value, (), replacements)
+            if template is None:
+                # Not a valid format string, this will raise the error.
+                _FORMATTER.vformat(value, (), replacements)
+            value = template.render(replacements)
         except:
             print("Replacements: {}".format(replacements))
             print("Error: Could not replace replacements in value: {}".format(value))
@@ -299,19 +885,20 @@ class Resolver(object):
             raise
 
         # Check for SGTK templates defined in the config.
-        regexp = self.SGTK_TEMPLATE_REGEX
-        replace_str = "SGTKTEMPLATE<{}>"
-        matches = re.findall(regexp, value)
-        for match in matches:
-            template_name = match[1]
-            template_value = self._get_sgtk_template_value(template_name)
-            if template_value:
-                sub = replace_str.format(match[1])
-                value = value.replace(sub, template_value)
+        if "SGTKTEMPLATE<" in value:
+            replace_str = "SGTKTEMPLATE<{}>"
+            matches = self.SGTK_TEMPLATE_PATTERN.findall(value)
+            for match in matches:
+                template_name = match[1]
+                template_value = self._get_sgtk_template_value(template_name)
+                if template_value:
+                    sub = replace_str.format(match[1])
+                    value = value.replace(sub, template_value)
 
         # Finally replace any extra environment variables which were added from the 
         # values of replaced replacements.
-        value = os.path.expandvars(value)
+        if _has_environment_variables(value):
+            value = os.path.expandvars(value)
 
         return value
 
@@ -357,30 +944,13 @@ class Resolver(object):
 
         The swap_paths dict allows you to specify paths for multiple operating
         systems and automatically swap between them based on he current operating
-        system.
-
-        NOTE: This just performs a blind string substitution. Meaning if any 
-            swap paths accidentally appear in a string, they will be swapped 
-            regardless of whether or not they are paths.
+        system. (See PathSwapTable)
 
         Args:
             value (str): The value to swap the paths in.
         """
 
-        if not self.path_swap_lookup:
+        if self.path_swap_table is None:
             return value
 
-        system = platform.system().lower()
-        for swap_path in self.path_swap_lookup:
-            # We use the first path in the list of paths for the current OS.
-            # This is important so that the user can configure a consistent 
-            # default which paths get mapped to.
-            current_os_path_options = self.path_swap_lookup[swap_path][system]
-
-            # Only perform the swap if the root path is not already a valid path 
-            # for this OS
-            if swap_path not in current_os_path_options and swap_path in value:
-                default_os_path = current_os_path_options[0]
-                value = value.replace(swap_path, default_os_path)
-
-        return value
+        return self.path_swap_table.swap(value)
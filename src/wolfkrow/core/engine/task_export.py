@@ -1,13 +1,34 @@
+import shlex
+
+
 
 
 
 class TaskExport(object):
-    def __init__(self, task, executable, executable_args=None, args=None):
+    def __init__(
+        self, 
+        task, 
+        executable, 
+        executable_args=None, 
+        args=None, 
+        json_args_file=None, 
+        manifest_file=None, 
+        manifest_record=None
+    ):
         self.task = task
         self.executable = executable
         self.executable_args = executable_args
         self.task_args = args
 
+        # Path to the JSON file containing the task's args, if it was exported 
+        # to one.
+        self.json_args_file = json_args_file
+
+        # Path to the JobManifest, and the ID of the record containing the task's 
+        # args, if it was exported to one.
+        self.manifest_file = manifest_file
+        self.manifest_record = manifest_record
+
         self.deadline_id = None
 
     @property
@@ -41,10 +62,13 @@ class TaskExport(object):
         args = []
         
         if self.executable_args:
-            args.extend(self.executable_args)
+            # Skip empty args. (An unset WOLFKROW_DEFAULT_COMMAND_LINE_EXECUTABLE_ARGS 
+            # variable results in a single empty arg.)
+            args.extend([arg for arg in self.executable_args if arg])
             
-        # TODO: This will break if an argument has a space in it.
+        # Split the same way a shell would, so that quoted args containing 
+        # spaces are kept intact, and the quotes themselves are removed.
         if self.task_args:
-            args.extend(self.task_args.split())
+            args.extend(shlex.split(self.task_args))
 
         return args
\ No newline at end of file
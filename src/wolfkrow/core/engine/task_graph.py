@@ -5,16 +5,29 @@
 from __future__ import print_function
 
 from builtins import object
-import copy
+import asyncio
+import collections
+import datetime
 import fnmatch
+import functools
+import http.client
 import logging
 import networkx
 import os
+import re
+import socket
 import subprocess
 import tempfile
+import time
+import urllib.error
+
+from concurrent.futures import ThreadPoolExecutor
 
 from wolfkrow.core import utils
+from wolfkrow.core.engine.job_manifest import JobManifest
+from wolfkrow.core.engine.local_scheduler import LocalScheduler
 from wolfkrow.core.engine.resolver import Resolver
+from wolfkrow.core.engine.task_result import TaskResult
 
 logging.basicConfig(level=logging.WARNING)
 
@@ -29,6 +42,26 @@ class TaskGraphValidationException(TaskGraphException):
     pass
 
 
+# Number of bytes to read at a time from the output of tasks run by execute_async.
+STREAM_READ_SIZE = 65536
+
+# Errors raised while submitting a job to deadline which are worth retrying. 
+# (Connection errors, and errors from the HTTP layer.)
+RETRYABLE_SUBMISSION_ERRORS = (OSError, http.client.HTTPException)
+
+# Error messages returned by the deadline API which are worth retrying. (Server 
+# errors, and timeouts.) Anything else (Ex: A bad plugin, pool or job info key) 
+# will fail again, so is not retried.
+RETRYABLE_SUBMISSION_MESSAGE = re.compile(r"HTTP Status Code: 5\d\d|timed out", re.IGNORECASE)
+
+
+def _is_timeout(error):
+    """ Returns whether or not the error is caused by a timeout. """
+    if isinstance(error, urllib.error.URLError):
+        error = error.reason
+    return isinstance(error, socket.timeout)
+
+
 class TaskGraph(object):
     """ Provides an interface to build, and execute a series of tasks.
     """
@@ -51,6 +84,16 @@ class TaskGraph(object):
         settings_manager = utils.WolfkrowSettings(settings_file=settings_file)
         self._settings = settings_manager.settings
         self._tasks = {}
+
+        # Reverse dependency index. Maps a dependency name to the full names of 
+        # the tasks which depend on it, so that dependents can be found without 
+        # scanning every task in the graph.
+        self._dependents = collections.defaultdict(set)
+
+        # Cache of the additional deadline job attributes. 
+        # (See _get_additional_job_attrs)
+        self._job_attrs_cache = {}
+
         self._prefix = prefix
         self.name = name
         self.replacements = replacements or {}
@@ -80,6 +123,19 @@ class TaskGraph(object):
             Raises:
                 TaskGraphException: Task Name in Graph is not Unique.
         """
+        edges = self._add_task(task, prefix=prefix)
+
+        # Add the edges to the graph.
+        self._graph.add_edges_from(edges)
+
+    def _add_task(self, task, prefix=None):
+        """ Adds a task to the task dictionary, the graph network, and the 
+            reverse dependency index. See add_task.
+
+            Returns:
+                list: The dependency edges of the task, which still need to be 
+                    added to the graph.
+        """
         if prefix:
             # If this task already has a prefix, then we need to add the new 
             # prefix to the existing prefix.
@@ -103,13 +159,19 @@ class TaskGraph(object):
         edges = []
         for dependency in task.dependencies:
             edges.append((dependency, task.name))
+            self._dependents[dependency].add(task.full_name)
 
-        # Add the edges to the graph.
-        self._graph.add_edges_from(edges)
+        return edges
 
     def add_tasks(self, tasks, prefix=None):
+        """ Adds multiple tasks to the task graph. All the dependency edges are
+            added to the graph network in a single batch. (See add_task)
+        """
+        edges = []
         for task in tasks:
-            self.add_task(task, prefix=prefix)
+            edges.extend(self._add_task(task, prefix=prefix))
+
+        self._graph.add_edges_from(edges)
 
     def merge_task_graph(self, task_graph, prefix=None):
         self.add_tasks(task_graph._tasks.values(), prefix=prefix)
@@ -117,9 +179,35 @@ class TaskGraph(object):
     def add_dependency(self, task, dependency):
         """ Adds an additional dependency to a task already in the task graph.
         """
-        task.add_dependency(dependency)
+        self.add_dependencies(task, [dependency])
 
-        self._graph.add_edge(dependency, task.name)
+    def add_dependencies(self, task, dependencies):
+        """ Adds multiple additional dependencies to a task already in the task graph.
+        """
+        edges = []
+        for dependency in dependencies:
+            task.add_dependency(dependency)
+            self._dependents[dependency].add(task.full_name)
+            edges.append((dependency, task.name))
+
+        self._graph.add_edges_from(edges)
+
+    def get_dependents(self, task_name):
+        """ Returns the tasks which depend on the given task name.
+
+            Args:
+                task_name (str): The name of the task. (Without prefix)
+
+            Returns:
+                list: The dependent Task objects.
+        """
+        dependents = []
+        for task_full_name in self._dependents.get(task_name, ()):
+            task = self._tasks.get(task_full_name)
+            if task is not None:
+                dependents.append(task)
+
+        return dependents
 
     def validate_task_graph(self):
         """ Validates the current Task graph.
@@ -131,7 +219,7 @@ class TaskGraph(object):
         if not networkx.is_directed_acyclic_graph(self._graph):
             raise TaskGraphValidationException("Task Graph contains circular dependencies.")
 
-    def export_tasks(self, export_type="Json", temp_dir=None, deadline=False):
+    def export_tasks(self, export_type="Json", temp_dir=None, deadline=False, use_manifest=None, max_workers=None):
         """ Exports each individual task to its standalone state for execution.
 
             Note: there is some weird logic here to handle tasks that expand into 
@@ -150,38 +238,87 @@ class TaskGraph(object):
                     3) Value pointed to by any of the temp dir environment 
                         variables as dictated by tempfile.mkdtemp()
                 deadline (bool): Whether or not to submit
+                use_manifest (bool): When exporting to Json, write the args of 
+                    every task to a single JobManifest file, rather than a JSON 
+                    file per task. Defaults to the "use_manifest" export setting.
+                max_workers (int): The maximum number of tasks to export at once.
+                    Defaults to the "concurrency" export setting.
         """
 
-        exported_tasks = {}
-
         temp_dir = temp_dir or self.temp_dir
         if temp_dir is None:
             temp_dir = tempfile.mkdtemp()
         logging.info("TEMPDIR: " + temp_dir)
 
-        # Create a copy of the tasks dictionary.
-        tasks = copy.copy(self._tasks)
-        for task in list(tasks.values()):
+        if use_manifest is None:
+            use_manifest = (self._settings.get("export") or {}).get("use_manifest", False)
 
-            # Export scripts for task.
-            exported = task.export(
+        manifest = None
+        if use_manifest and export_type == "Json":
+            manifest_name = "{time}_{job_name}_manifest.jsonl".format(
+                time=datetime.datetime.now().strftime("%Y%m%d_%H%M%S"),
+                job_name=(self.name or "wolfkrow").strip().replace(" ", "_"),
+            )
+            manifest = JobManifest(os.path.join(temp_dir, manifest_name))
+
+        if max_workers is None:
+            max_workers = (self._settings.get("export") or {}).get("concurrency") or 8
+
+        try:
+            return self._export_tasks(export_type, temp_dir, deadline, manifest, max_workers)
+        finally:
+            if manifest is not None:
+                manifest.close()
+
+    def _export_tasks(self, export_type, temp_dir, deadline, manifest, max_workers):
+        """ Exports each task. (See export_tasks)
+
+            Exporting a task does not depend on any of the other tasks, so the 
+            tasks are exported on a pool of threads. The task graph is only 
+            updated with the new tasks afterwards, one task at a time in the 
+            original order, so the result is the same as exporting them one by one.
+
+            Returns:
+                dict: Task full name => TaskExport
+        """
+        exported_tasks = {}
+
+        def export_task(task):
+            return task.export(
                 export_type=export_type, 
                 temp_dir=temp_dir, 
                 job_name=self.name,
                 deadline=deadline,
+                manifest=manifest,
             )
 
-            exported_task_names = [export.task.full_name for export in exported]
+        # Create a copy of the tasks list, because exporting adds new tasks.
+        tasks = list(self._tasks.values())
+        if max_workers > 1 and len(tasks) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+                # Results are returned in the same order as the tasks, and the 
+                # first exception raised by an export is re-raised here.
+                all_exported = list(executor.map(export_task, tasks))
+        else:
+            all_exported = [export_task(task) for task in tasks]
+
+        for task, exported in zip(tasks, all_exported):
+
+            exported_task_names = set(export.task.full_name for export in exported)
 
             if len(exported) > 1:
-                for exported_task in exported[1:]:
-                    self.add_task(exported_task.task, prefix=self._prefix)
-                    # Update the new tasks to depend on the original task.
-                    self.add_dependency(exported_task.task, task.name)
-
-                # Search the task graph for tasks which depended on the original 
-                # task, and update them to depend on the new tasks.
-                for task2 in list(self._tasks.values()):
+                new_tasks = [exported_task.task for exported_task in exported[1:]]
+                new_task_names = [new_task.name for new_task in new_tasks]
+
+                # Update the new tasks to depend on the original task, then add
+                # them all to the task graph in one go.
+                for new_task in new_tasks:
+                    new_task.add_dependency(task.name)
+                self.add_tasks(new_tasks, prefix=self._prefix)
+
+                # Look up the tasks which depended on the original task, and 
+                # update them to depend on the new tasks.
+                for task2 in self.get_dependents(task.name):
                     # Do not add a dependency to yourself.
                     if task2.name == task.name:
                         continue
@@ -190,9 +327,7 @@ class TaskGraph(object):
                     if task2.full_name in exported_task_names:
                         continue
 
-                    if task.name in task2.dependencies:
-                        for exported_task in exported[1:]:
-                            self.add_dependency(task2, exported_task.task.name)
+                    self.add_dependencies(task2, new_task_names)
 
             for exported_task in exported:
                 # Add this task to the exported tasks
@@ -209,52 +344,321 @@ class TaskGraph(object):
         self, 
         temp_dir=None,
         export_type="Json",
+        max_workers=None,
+        resources=None,
+        mode="subprocess",
     ):
+        """ Exports, then executes the task graph on the local machine.
 
-        exported_tasks = self.export_tasks(export_type=export_type, temp_dir=temp_dir)
+            Every task whose dependencies have successfully completed is launched
+            straight away, up to max_workers tasks at a time, as long as the 
+            resources it requires are available. Tasks which depend on a failed 
+            task are skipped.
 
-        results = {}
-        taskExecutionOrder = networkx.topological_sort(self._graph)
-        for task_name in taskExecutionOrder:
-            task_export = exported_tasks.get(task_name)
-            if task_export is None:
-                logging.debug("Skipping Task '%s' because it was added as a "
-                    "dependency, but was never added to the TaskGraph." % task_name)
-                continue
+            There are 2 execution modes:
+            *subprocess*: Every exported task is run in its own process via its
+                exported command. (Default)
+            *inprocess*: Tasks whose type is marked as inprocess_safe are called 
+                directly on a worker thread, skipping the interpreter start up 
+                and re-construction of the task. All other tasks (Ex: DCC tasks 
+                such as NukeRender) are still run in their own process.
 
-            ready = True
-            for dependencyName in task_export.task.dependencies:
-                #TODO: Add dependency inheritance support + corrected logic around task name prefixes
-                # If the dependency has no entry, it means it was never actually added it to the task graph.
-                if results.get(dependencyName) is False:
-                    ready = False
-                    break
+            Kwargs:
+                temp_dir (str): Temp directory to use as each tasks temp_dir.
+                export_type (str): The export format for tasks to use.
+                max_workers (int): The maximum number of tasks to run at once. 
+                    Defaults to the number of CPUs on this machine.
+                resources (dict): Resource name => amount available for running
+                    tasks. Defaults to the "local" resources in the settings file.
+                mode (str): Either "subprocess" or "inprocess". See above.
 
-            if not ready:
-                logging.warning("This task's dependencies failed to execute. Skipping task: '%s'" % task_export.task.full_name)
-                continue
+            Returns:
+                dict: Task full name => True if the task succeeded, False if it 
+                    failed, or None if it was skipped.
+
+            Raises:
+                TaskGraphException: Unknown execution mode.
+        """
+        if mode not in ("subprocess", "inprocess"):
+            raise TaskGraphException("Unknown execution mode: '{}'. Expected one of "
+                "'subprocess' or 'inprocess'".format(mode))
 
-            args = task_export.as_list()
+        exported_tasks = self.export_tasks(export_type=export_type, temp_dir=temp_dir)
 
-            #TODO: The python script being executed here can be a security liability 
-            # since they can be modified between being written out, and being executed 
-            # here. Either add a mechanism for ensuring they have not been modified 
-            # or prevent them from being modified.
-            process = subprocess.Popen(
-                args,
-                shell=False,
-            )
-            process.communicate()
+        if resources is None:
+            resources = self._get_local_resources()
 
-            if process.returncode == 0:
-                logging.info("Task '%s' Successfully completed" % task_export.task.full_name)
-                results[task_export.task.full_name] = True
+        scheduler = LocalScheduler(max_workers=max_workers, resources=resources)
+        for task_full_name, task_export in exported_tasks.items():
+            if mode == "inprocess" and task_export.task.inprocess_safe:
+                runnable = functools.partial(self._execute_inprocess_task, task_export)
             else:
-                logging.error("Task '%s' Failed. Will skip all dependant tasks." % task_export.task.full_name)
-                results[task_export.task.full_name] = False
+                runnable = functools.partial(self._execute_local_task, task_export)
+
+            dependencies = self._get_exported_dependencies(task_export, exported_tasks)
+            scheduler.add_job(
+                task_full_name,
+                runnable,
+                dependencies=dependencies,
+                resources=self._get_task_resources(task_export.task),
+            )
+
+        results = scheduler.run()
 
         #TODO: Cleanup the tempdir from exported_tasks.
 
+        return results
+
+    def _execute_inprocess_task(self, task_export):
+        """ Runs a single exported task directly in this process.
+
+            Returns:
+                bool: Whether or not the task completed successfully.
+        """
+        # Make sure the paths created by the tasks which already ran in this 
+        # process are found.
+        Resolver.clear_path_cache()
+
+        # wolfkrow_run_task exits with the value returned by the task, so mirror
+        # that here. (0 or None is success.)
+        result = task_export.task()
+        return not result
+
+    async def execute_async(
+        self,
+        temp_dir=None,
+        export_type="Json",
+        max_workers=None,
+        resources=None,
+        output_callback=None,
+    ):
+        """ Coroutine which exports, then executes the task graph on the local 
+            machine without blocking the event loop. 
+
+            Tasks are scheduled the same way as execute_local, but each task's 
+            process is driven by asyncio, and its stdout/stderr are streamed as 
+            they are written. This allows the task graph to be run from inside a 
+            UI event loop.
+
+            Kwargs:
+                temp_dir (str): Temp directory to use as each tasks temp_dir.
+                export_type (str): The export format for tasks to use.
+                max_workers (int): The maximum number of tasks to run at once. 
+                    Defaults to the number of CPUs on this machine.
+                resources (dict): Resource name => amount available for running
+                    tasks. Defaults to the "local" resources in the settings file.
+                output_callback (callable): Called with (task_full_name, stream_name, line)
+                    for every line a task writes. stream_name is either "stdout" 
+                    or "stderr".
+
+            Returns:
+                dict: Task full name => TaskResult.
+        """
+        # Exporting writes files to disk, so do it on a thread to keep the event 
+        # loop responsive.
+        loop = asyncio.get_running_loop()
+        exported_tasks = await loop.run_in_executor(
+            None,
+            functools.partial(self.export_tasks, export_type=export_type, temp_dir=temp_dir),
+        )
+
+        if resources is None:
+            resources = self._get_local_resources()
+
+        task_results = {}
+        scheduler = LocalScheduler(max_workers=max_workers, resources=resources)
+        for task_full_name, task_export in exported_tasks.items():
+            dependencies = self._get_exported_dependencies(task_export, exported_tasks)
+            scheduler.add_job(
+                task_full_name,
+                functools.partial(self._execute_async_task, task_export, task_results, output_callback),
+                dependencies=dependencies,
+                resources=self._get_task_resources(task_export.task),
+            )
+
+        results = await scheduler.run_async()
+
+        # Add results for the tasks which were skipped.
+        for task_full_name, result in results.items():
+            if task_full_name not in task_results:
+                task_results[task_full_name] = TaskResult(task_full_name, TaskResult.SKIPPED)
+
+        return task_results
+
+    async def _execute_async_task(self, task_export, task_results, output_callback=None):
+        """ Runs a single exported task in its own process, streaming its output.
+
+            Args:
+                task_export (TaskExport): The exported task to run.
+                task_results (dict): Dictionary to add this tasks TaskResult to.
+
+            Kwargs:
+                output_callback (callable): See execute_async.
+
+            Returns:
+                bool: Whether or not the task completed successfully.
+        """
+        task_full_name = task_export.task.full_name
+        args = [task_export.executable] + task_export.as_list()
+
+        def add_line(line, stream_name, lines):
+            line = line.decode(errors="replace").rstrip("\r\n")
+            lines.append(line)
+            if output_callback is not None:
+                output_callback(task_full_name, stream_name, line)
+
+        async def read_stream(stream, stream_name, lines):
+            # Read in chunks and split the lines here, rather than using 
+            # readline, which fails on lines longer than the limit of the 
+            # StreamReader. (Ex: Progress output which only uses "\r")
+            buffer = bytearray()
+            while True:
+                chunk = await stream.read(STREAM_READ_SIZE)
+                if not chunk:
+                    break
+
+                buffer.extend(chunk)
+                end = buffer.find(b"\n")
+                while end != -1:
+                    add_line(bytes(buffer[:end + 1]), stream_name, lines)
+                    del buffer[:end + 1]
+                    end = buffer.find(b"\n")
+
+            if buffer:
+                add_line(bytes(buffer), stream_name, lines)
+
+        start_time = time.time()
+        process = None
+        stdout_lines = []
+        stderr_lines = []
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+
+            await asyncio.gather(
+                read_stream(process.stdout, "stdout", stdout_lines),
+                read_stream(process.stderr, "stderr", stderr_lines),
+            )
+            returncode = await process.wait()
+        except Exception as e:
+            # The process could not be started (Ex: Missing executable), or the
+            # output could not be handled. Either way, the task has failed.
+            logging.error("Task '%s' could not be run: %s" % (task_full_name, e))
+            if process is not None and process.returncode is None:
+                process.kill()
+                await process.wait()
+
+            stderr_lines.append("{}: {}".format(type(e).__name__, e))
+            task_results[task_full_name] = TaskResult(
+                task_full_name,
+                TaskResult.FAILED,
+                returncode=process.returncode if process is not None else None,
+                stdout="\n".join(stdout_lines),
+                stderr="\n".join(stderr_lines),
+                start_time=start_time,
+                end_time=time.time(),
+            )
+            return False
+
+        status = TaskResult.SUCCEEDED if returncode == 0 else TaskResult.FAILED
+        task_results[task_full_name] = TaskResult(
+            task_full_name,
+            status,
+            returncode=returncode,
+            stdout="\n".join(stdout_lines),
+            stderr="\n".join(stderr_lines),
+            start_time=start_time,
+            end_time=time.time(),
+        )
+
+        return returncode == 0
+
+    def _get_local_resources(self):
+        """ Reads the settings file to get the resources available for running 
+            tasks on this machine.
+
+            Returns:
+                dict: Resource name => amount available. The "cpu" resource 
+                    defaults to the number of CPUs on this machine.
+        """
+        resources = {"cpu": os.cpu_count()}
+
+        configured_resources = self._settings.get("local", {}).get("resources") or {}
+        for resource, amount in configured_resources.items():
+            if amount is not None:
+                resources[resource] = amount
+
+        return resources
+
+    def _get_task_resources(self, task):
+        """ Gets the resources required to run the given task locally. 
+
+            Starts with any task_type specific overrides from the settings file,
+            and then applies the resources set on the task itself.
+
+            Args:
+                task (Task): The task to get the resources for.
+
+            Returns:
+                dict: Resource name => amount required.
+        """
+        resources = {}
+
+        overrides = self._settings.get("local", {}).get("task_overrides") or {}
+        task_overrides = overrides.get(task.__class__.__name__)
+        if task_overrides and task_overrides.get("resources"):
+            resources.update(task_overrides["resources"])
+
+        if task.resources:
+            resources.update(task.resources)
+
+        return resources
+
+    def _get_exported_dependencies(self, task_export, exported_tasks):
+        """ Converts the dependency names of an exported task into the full names
+            of the exported tasks it depends on.
+
+            Tasks with a prefix depend on the task with the same prefix when it
+            exists, otherwise on the un-prefixed task name.
+        """
+        dependencies = []
+        name_prefix = task_export.task.name_prefix
+        for dependency_name in task_export.task.dependencies:
+            if name_prefix:
+                prefixed_name = name_prefix + "_" + dependency_name
+                if prefixed_name in exported_tasks:
+                    dependencies.append(prefixed_name)
+                    continue
+
+            # If the dependency has no entry, it means it was never actually added it to the task graph.
+            if dependency_name in exported_tasks:
+                dependencies.append(dependency_name)
+
+        return dependencies
+
+    def _execute_local_task(self, task_export):
+        """ Runs a single exported task in its own process.
+
+            Returns:
+                bool: Whether or not the task completed successfully.
+        """
+        args = [task_export.executable] + task_export.as_list()
+
+        #TODO: The python script being executed here can be a security liability 
+        # since they can be modified between being written out, and being executed 
+        # here. Either add a mechanism for ensuring they have not been modified 
+        # or prevent them from being modified.
+        process = subprocess.Popen(
+            args,
+            shell=False,
+        )
+        process.communicate()
+
+        return process.returncode == 0
+
     def _get_additional_job_attrs(self, replacements=None, sgtk=None, task_type=None):
         """ Reads the settings file to get the default Group, Limits, and Pool 
             for each deadline job, and then also does a lookup to see if there
@@ -267,6 +671,23 @@ class TaskGraph(object):
                 Dict: Dictionary containing Group, Limits, and Pool. Intended for 
                     use when submitting a Task to Deadline.
         """
+        # Resolving the job attributes is relatively expensive, and the result 
+        # only depends on the task type and the replacements, so cache it.
+        cache_key = (task_type, utils.fingerprint(replacements), id(sgtk))
+        job_attrs = self._job_attrs_cache.get(cache_key)
+        if job_attrs is None:
+            job_attrs = self._resolve_additional_job_attrs(
+                replacements=replacements, 
+                sgtk=sgtk, 
+                task_type=task_type
+            )
+            self._job_attrs_cache[cache_key] = job_attrs
+
+        # Return a copy, since the caller is free to modify the job attributes.
+        return dict(job_attrs)
+
+    def _resolve_additional_job_attrs(self, replacements=None, sgtk=None, task_type=None):
+        """ Uncached version of _get_additional_job_attrs. """
         # FIXME: there is no "resolver" key in the settings file. This lives in 
         #   the wolfkrow.yaml file, so we should be getting this value from there. 
         #   And while were at it, make sure to also grab the new swap paths value.
@@ -313,9 +734,14 @@ class TaskGraph(object):
         temp_dir=None,
         export_type="Json",
         dependency_inheritance=True,
+        max_concurrent_submissions=None,
+        deadline_connection=None,
     ):
         """ Executes a task graph on deadline. 
 
+            Jobs are submitted concurrently. Each job is submitted as soon as the
+            jobs it depends on have been submitted (and have a job ID).
+
             Kwargs:
                 batch_name (str): The batch name of the job on deadline.
                 inherit_environment (bool): Passes the current environment on to 
@@ -328,16 +754,24 @@ class TaskGraph(object):
                 dependency_inheritance (bool): Whether or not to inherit dependencies 
                     from tasks with a different prefix. Typically only relevant when
                     Tasks from multiple TaskGraphs are merged into a single TaskGraph.
+                max_concurrent_submissions (int): The maximum number of jobs to 
+                    submit at once. Defaults to the "submission_concurrency" 
+                    deadline setting.
+                deadline_connection (DeadlineCon): Connection to use for submitting
+                    the jobs. A new connection to the deadline web service from 
+                    the settings file is created if not provided.
         """
 
         # Initialize the environment as an empty dict if nothing was passed in.
         if environment is None:
             environment = {}
 
-        import Deadline.DeadlineConnect as Connect
-        deadline = Connect.DeadlineCon(
-            self._settings["deadline"]["host_name"],
-            self._settings["deadline"]["port"])
+        deadline = deadline_connection
+        if deadline is None:
+            import Deadline.DeadlineConnect as Connect
+            deadline = Connect.DeadlineCon(
+                self._settings["deadline"]["host_name"],
+                self._settings["deadline"]["port"])
 
         def submit_task_to_deadline(task_export, deadline, dependencies, batch_name=None, frames=None):
             dependencies_str = ",".join(dependencies)
@@ -353,9 +787,9 @@ class TaskGraph(object):
 
             # Add the additional job attributes from the configuration file.
             additional_job_attrs = self._get_additional_job_attrs(
-                replacements=task.task.replacements,
-                sgtk=task.task.sgtk,
-                task_type=task.task.__class__.__name__
+                replacements=task_export.task.replacements,
+                sgtk=task_export.task.sgtk,
+                task_type=task_export.task.__class__.__name__
             )
             job_attrs.update(additional_job_attrs)
 
@@ -367,76 +801,45 @@ class TaskGraph(object):
                 job_attrs.update(additional_job_attributes)
 
             # If the task has a start_frame, end_frame, and chunk_size, then add these attributes to the deadline job.
-            if (hasattr(task.task, "chunkable") and task.task.chunkable is True and
-                hasattr(task.task, "start_frame") and task.task.start_frame is not None and
-                hasattr(task.task, "end_frame") and task.task.end_frame is not None
+            if (hasattr(task_export.task, "chunkable") and task_export.task.chunkable is True and
+                hasattr(task_export.task, "start_frame") and task_export.task.start_frame is not None and
+                hasattr(task_export.task, "end_frame") and task_export.task.end_frame is not None
             ):
-                job_attrs['Frames'] = "{}-{}".format(task.task.start_frame, task.task.end_frame)
-                chunk_size = getattr(task.task, "chunk_size", 32) # Default to 32 if no chunk size is set.
+                job_attrs['Frames'] = "{}-{}".format(task_export.task.start_frame, task_export.task.end_frame)
+                chunk_size = getattr(task_export.task, "chunk_size", 32) # Default to 32 if no chunk size is set.
 
                 job_attrs['ChunkSize'] = chunk_size
 
                 # Override chunk size to the total frame count if it is 0 or None
                 if chunk_size is None or chunk_size == 0:
-                    job_attrs['ChunkSize'] = task.task.end_frame - task.task.start_frame + 1
-
-            environment_dict = {}
-            if inherit_environment:
-                # First we apply the filters from our settings.
-                inclusion_filters = self._settings.get("deadline", {}).get("environment_inclusion_filters", [])
-                exclusion_filters = self._settings.get("deadline", {}).get("environment_exclusion_filters", [])
-                inclusion_list = self._settings.get("deadline", {}).get("environment_inclusion_list", [])
-                exclusion_list = self._settings.get("deadline", {}).get("environment_exclusion_list", [])
-
-                # Build the initial list of included keys. Includes all by default.
-                filtered_environment_keys = []
-                if inclusion_filters:
-                    for inclusion_filter in inclusion_filters:
-                        filtered = fnmatch.filter(os.environ.keys(), inclusion_filter)
-                        filtered_environment_keys.extend(filtered)
-                else:
-                    filtered_environment_keys = os.environ.keys()
-
-                # Now remove stuff which matches the exclusion filters
-                excluded = set()
-                if exclusion_filters:
-                    for exclusion_filter in exclusion_filters:
-                        filtered = fnmatch.filter(filtered_environment_keys, exclusion_filter)
-                        excluded.union(set(filtered))
-
-                # Also remove stuff which is explicitly excluded
-                if exclusion_list:
-                    excluded.union(set(exclusion_list))
-
-                # Now add stuff which is explicitly included
-                if inclusion_list:
-                    filtered_environment_keys.extend(inclusion_list)
-
-                # Now finally build the environment:
-                environment_dict = { key: os.environ[key] for key in filtered_environment_keys if key not in excluded and key in os.environ }
-
-
-            environment_dict.update(environment)
+                    job_attrs['ChunkSize'] = task_export.task.end_frame - task_export.task.start_frame + 1
 
             # Add Environment variables.
-            var_index = 0
-            for key, value in list(environment_dict.items()):
-                job_attrs['EnvironmentKeyValue%s' % var_index] = "%s=%s" % (key, value)
-                var_index += 1
+            job_attrs.update(environment_job_attrs)
 
             plugin_attrs = {
-                "Executable": task.executable,
-                "Arguments": task.args,
+                "Executable": task_export.executable,
+                "Arguments": task_export.args,
             }
 
-            job = deadline.Jobs.SubmitJob(job_attrs, plugin_attrs)
-            if isinstance(job, str):
-                print("Failed to submit job. {}".format(job))
-                return None
-            else:
+            job = self._submit_deadline_job(deadline, job_attrs, plugin_attrs)
+            if job is not None:
                 print("Job: {:<55} - {}".format(job.get("Props").get("Name"), job["_id"]))
-                return job
+            return job
+
 
+        # The job attributes and environment only need to be computed once per 
+        # submission, rather than once per job.
+        self._job_attrs_cache = {}
+
+        environment_dict = {}
+        if inherit_environment:
+            environment_dict = self._get_filtered_environment()
+        environment_dict.update(environment)
+
+        environment_job_attrs = {}
+        for var_index, (key, value) in enumerate(environment_dict.items()):
+            environment_job_attrs['EnvironmentKeyValue%s' % var_index] = "%s=%s" % (key, value)
 
         exported_tasks = self.export_tasks(
             export_type=export_type, 
@@ -445,74 +848,240 @@ class TaskGraph(object):
         )
         deadline_jobs = {}
 
-        taskExecutionOrder = networkx.topological_sort(self._graph)
-        for task_name in taskExecutionOrder:
-            tasks = []
-            # The task graph does not deal with prefixes, so we need to get all
-            # task exports which have this task_name (without prefix).
-            # We will correct the task dependencies later depending on whether or
-            # not inheritance is enabled.
-            for task_export in exported_tasks.values():
-                if task_export.task.name == task_name:
-                    tasks.append(task_export)
-
-            if len(tasks) == 0:
-                logging.debug("Skipping Task '%s' because it was added as a dependency, but was never added to the TaskGraph." % task_name)
-                continue
+        # The task graph does not deal with prefixes, so we need to look up task 
+        # exports by their task name (without prefix).
+        exports_by_name = self._index_exports_by_name(exported_tasks)
+
+        submitted_jobs = {}
+        failed_jobs = set()
+        submission_errors = []
+        def submit_task(task, dependency_names):
+            try:
+                return _submit_task(task, dependency_names)
+            except Exception as e:
+                # Unexpected errors are re-raised once the scheduler has finished.
+                submission_errors.append(e)
+                raise
+
+        def _submit_task(task, dependency_names):
+            job_dependencies = []
+            for dependency_name in dependency_names:
+                # If the dependency has no deadline_id, it means it was never 
+                # actually added it to the task graph, or failed to submit.
+                dependency = exported_tasks.get(dependency_name)
+                if dependency and dependency.deadline_id is not None:
+                    job_dependencies.append(dependency.deadline_id)
+
+            # If there are any external dependency ID's, add them to the job_dependencies list as well.
+            if task.task.external_dependencies:
+                external_dependencies = task.task.external_dependencies.split(",")
+                job_dependencies.extend(external_dependencies)
+
+            deadline_job = submit_task_to_deadline(
+                task, 
+                deadline, 
+                job_dependencies, 
+                batch_name=batch_name
+            )
+            if deadline_job:
+                submitted_jobs[task.task.full_name] = deadline_job
+                task.deadline_id = deadline_job["_id"]
+            else:
+                failed_jobs.add(task.task.full_name)
+
+            # A job which failed to submit does not stop its dependents from 
+            # being submitted, they just won't depend on it.
+            return True
+
+        if max_concurrent_submissions is None:
+            max_concurrent_submissions = self._settings["deadline"].get("submission_concurrency") or 8
+        scheduler = LocalScheduler(max_workers=max_concurrent_submissions)
+
+        for task in exported_tasks.values():
+            dependency_names = []
+            for dependency_name in task.task.dependencies:
+                if dependency_inheritance:
+                    # If dependency inheritance is turned on, then we must look
+                    # at all the exported tasks to see if the tasks name matches
+                    # our dependency. This is for when multiple task graphs have
+                    # been merged into a single task graph. There may be cases
+                    # where we want tasks in our original task graph to depend on
+                    # tasks in the merged task graph.
+                    # Ex: A Plate Publish TaskGraph is merged with a Grade Publish,
+                    #   TaskGraph and we want the plate quicktime generation to 
+                    #   depend on the grade publish.
+                    for exported_task in exports_by_name.get(dependency_name, []):
+                        dependency_names.append(exported_task.task.full_name)
+                else:
+                    # If dependency inheritance is turned off, then we only want 
+                    # tasks to depend on tasks with the same prefix as themselves.
+                    # This will be useful in cases where multiple TaskGraphs of 
+                    # the same workflow have been merged. In these cases we want
+                    # the tasks to ignore the tasks from the other merged TaskGraphs.
+                    # Ex: A Plate Publish task Graph is merged with another Plate
+                    #   Publish task graph. In this case, we want the plate quicktime
+                    #   generation to depend on its own plate generation task, but no
+                    #   other plate generation tasks.
+                    dependency_names.append(task.task.name_prefix + "_" + dependency_name)
+
+            scheduler.add_job(
+                task.task.full_name,
+                functools.partial(submit_task, task, dependency_names),
+                dependencies=dependency_names,
+            )
+
+        scheduler.run()
+
+        if submission_errors:
+            raise submission_errors[0]
+
+        # Every job should have been submitted, or failed to submit. Anything 
+        # else was never attempted. (Ex: Because of circular dependencies)
+        unsubmitted = [
+            task.task.full_name for task in exported_tasks.values()
+            if task.task.full_name not in submitted_jobs 
+            and task.task.full_name not in failed_jobs
+        ]
+        if unsubmitted:
+            raise TaskGraphException(
+                "The following jobs were never submitted to deadline: {}".format(", ".join(unsubmitted))
+            )
 
-            for task in tasks:
-                job_dependencies = []
-                def add_dependency(dependency_name):
-                    # If the dependency has no deadline_id, it means it was never actually added it to the task graph.
-                    dependency = exported_tasks.get(dependency_name)
-                    if dependency and dependency.deadline_id is not None:
-                        job_dependencies.append(dependency.deadline_id)
-
-                for dependency_name in task.task.dependencies:
-                    if dependency_inheritance:
-                        # If dependency inheritance is turned on, then we must look
-                        # at all the exported tasks to see if the tasks name matches
-                        # our dependency. This is for when multiple task graphs have
-                        # been merged into a single task graph. There may be cases
-                        # where we want tasks in our original task graph to depend on
-                        # tasks in the merged task graph.
-                        # Ex: A Plate Publish TaskGraph is merged with a Grade Publish,
-                        #   TaskGraph and we want the plate quicktime generation to 
-                        #   depend on the grade publish.
-                        for exported_task_name in exported_tasks:
-                            exported_task = exported_tasks[exported_task_name]
-                            if exported_task.task.name == dependency_name:
-                                add_dependency(exported_task_name)
-                    else:
-                        # If dependency inheritance is turned off, then we only want 
-                        # tasks to depend on tasks with the same prefix as themselves.
-                        # This will be useful in cases where multiple TaskGraphs of 
-                        # the same workflow have been merged. In these cases we want
-                        # the tasks to ignore the tasks from the other merged TaskGraphs.
-                        # Ex: A Plate Publish task Graph is merged with another Plate
-                        #   Publish task graph. In this case, we want the plate quicktime
-                        #   generation to depend on its own plate generation task, but no
-                        #   other plate generation tasks.
-                        dependency_name = task.task.name_prefix + "_" + dependency_name
-                        add_dependency(dependency_name)
-
-                # If there are any external dependency ID's, add them to the job_dependencies list as well.
-                if task.task.external_dependencies:
-                    external_dependencies = task.task.external_dependencies.split(",")
-                    job_dependencies.extend(external_dependencies)
-
-                deadline_job = submit_task_to_deadline(
-                    task, 
-                    deadline, 
-                    job_dependencies, 
-                    batch_name=batch_name
-                )
-                if deadline_job:
-                    deadline_jobs[task_name] = deadline_job
-                    task.deadline_id = deadline_job["_id"]
+        # Collect the submitted jobs in a deterministic order, regardless of the 
+        # order in which the submissions completed.
+        for task_name in networkx.topological_sort(self._graph):
+            for task in exports_by_name.get(task_name, []):
+                if task.task.full_name in submitted_jobs:
+                    deadline_jobs[task_name] = submitted_jobs[task.task.full_name]
 
         return deadline_jobs
 
+    def _submit_deadline_job(self, deadline, job_attrs, plugin_attrs):
+        """ Submits a job to deadline, retrying with an exponential backoff if 
+            the submission fails. Only connection errors, and server errors or 
+            timeouts reported by the deadline API, are retried. Any other error 
+            reported by the deadline API fails straight away, and any other 
+            exception is raised.
+
+            A submission which timed out may have created the job anyway, so it 
+            is only retried if the "submission_retry_timeouts" deadline setting 
+            is enabled.
+
+            The number of retries and the initial delay between them are read 
+            from the "submission_retries" and "submission_retry_delay" deadline 
+            settings.
+
+            Args:
+                deadline (DeadlineCon): Connection to the deadline web service.
+                job_attrs (dict): The job info for the job.
+                plugin_attrs (dict): The plugin info for the job.
+
+            Returns:
+                dict: The submitted job, or None if the job could not be submitted.
+        """
+        deadline_settings = self._settings["deadline"]
+        retries = deadline_settings.get("submission_retries")
+        if retries is None:
+            retries = 3
+        retry_delay = deadline_settings.get("submission_retry_delay")
+        if retry_delay is None:
+            retry_delay = 1.0
+        retry_timeouts = bool(deadline_settings.get("submission_retry_timeouts"))
+
+        attempt = 0
+        while True:
+            try:
+                job = deadline.Jobs.SubmitJob(job_attrs, plugin_attrs)
+            except RETRYABLE_SUBMISSION_ERRORS as e:
+                error = "{}: {}".format(type(e).__name__, e)
+                retryable = True
+                if _is_timeout(e) and not retry_timeouts:
+                    logging.warning("Submitting job '%s' timed out. The job may have been "
+                        "created anyway, so it will not be retried." % job_attrs.get("Name"))
+                    retryable = False
+                elif _is_timeout(e):
+                    logging.warning("Submitting job '%s' timed out. The job may have been "
+                        "created anyway, so retrying may submit a duplicate job." % job_attrs.get("Name"))
+            else:
+                # The deadline API returns an error message on failure.
+                if not isinstance(job, str):
+                    return job
+
+                error = job
+                retryable = RETRYABLE_SUBMISSION_MESSAGE.search(job) is not None
+
+            if not retryable or attempt >= retries:
+                print("Failed to submit job. {}".format(error))
+                return None
+
+            delay = retry_delay * (2 ** attempt)
+            attempt += 1
+            logging.warning("Failed to submit job '%s' (Attempt %s of %s). Retrying in %s seconds. %s" % 
+                (job_attrs.get("Name"), attempt, retries + 1, delay, error))
+            time.sleep(delay)
+
+    def _get_filtered_environment(self):
+        """ Filters the current environment using the inclusion and exclusion 
+            filters and lists from the deadline settings.
+
+            Returns:
+                dict: The environment variables to pass on to deadline jobs.
+        """
+        deadline_settings = self._settings.get("deadline", {})
+        inclusion_filters = deadline_settings.get("environment_inclusion_filters", [])
+        exclusion_filters = deadline_settings.get("environment_exclusion_filters", [])
+        inclusion_list = deadline_settings.get("environment_inclusion_list", [])
+        exclusion_list = deadline_settings.get("environment_exclusion_list", [])
+
+        # Build the initial list of included keys. Includes all by default.
+        environment_keys = list(os.environ.keys())
+        filtered_environment_keys = []
+        if inclusion_filters:
+            for inclusion_filter in inclusion_filters:
+                filtered = fnmatch.filter(environment_keys, inclusion_filter)
+                filtered_environment_keys.extend(filtered)
+        else:
+            filtered_environment_keys = environment_keys
+
+        # Now remove stuff which matches the exclusion filters
+        excluded = set()
+        if exclusion_filters:
+            for exclusion_filter in exclusion_filters:
+                filtered = fnmatch.filter(filtered_environment_keys, exclusion_filter)
+                excluded.update(filtered)
+
+        # Also remove stuff which is explicitly excluded
+        if exclusion_list:
+            excluded.update(exclusion_list)
+
+        # Now add stuff which is explicitly included
+        if inclusion_list:
+            filtered_environment_keys.extend(inclusion_list)
+
+        # Now finally build the environment:
+        environment_dict = {}
+        for key in filtered_environment_keys:
+            if key not in excluded and key in os.environ:
+                environment_dict[key] = os.environ[key]
+
+        return environment_dict
+
+    def _index_exports_by_name(self, exported_tasks):
+        """ Builds a lookup of the exported tasks by their task name (without prefix).
+
+            Args:
+                exported_tasks (dict): Task full name => TaskExport. (See export_tasks)
+
+            Returns:
+                dict: Task name => list of TaskExports with that name, in the 
+                    same order they appear in exported_tasks.
+        """
+        exports_by_name = collections.defaultdict(list)
+        for task_export in exported_tasks.values():
+            exports_by_name[task_export.task.name].append(task_export)
+
+        return exports_by_name
+
     def execute_legacy(self):
         """ Executes the task graph.
 
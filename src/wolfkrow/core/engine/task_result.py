@@ -0,0 +1,45 @@
+class TaskResult(object):
+    """ Structured result of a Task executed by the TaskGraph. """
+
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+    def __init__(self, name, status, returncode=None, stdout="", stderr="", start_time=None, end_time=None):
+        """ Initializes the TaskResult object.
+
+            Args:
+                name (str): Full name of the task.
+                status (str): One of SUCCEEDED, FAILED, or SKIPPED.
+
+            Kwargs:
+                returncode (int): The exit code of the task's process.
+                stdout (str): Everything the task wrote to stdout.
+                stderr (str): Everything the task wrote to stderr.
+                start_time (float): Time the task started. (Seconds since the epoch)
+                end_time (float): Time the task finished. (Seconds since the epoch)
+        """
+        self.name = name
+        self.status = status
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.start_time = start_time
+        self.end_time = end_time
+
+    @property
+    def success(self):
+        return self.status == self.SUCCEEDED
+
+    @property
+    def duration(self):
+        """ Returns the number of seconds the task ran for, or None if it never ran. """
+        if self.start_time is None or self.end_time is None:
+            return None
+
+        return self.end_time - self.start_time
+
+    def __repr__(self):
+        return "TaskResult(name={!r}, status={!r}, returncode={!r})".format(
+            self.name, self.status, self.returncode
+        )
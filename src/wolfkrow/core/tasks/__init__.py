@@ -1,37 +1,56 @@
-# Magic dictionary which is automatically populated with ALL wolfkrow.core.tasks.task.Task objects defined. 
-# (They only need to be imported -- See Below)
-all_tasks = {}
-
-# Import all the wolfkrow.core.tasks.task.Task objects we can find.
-# Note: Will always search this current directory plus all directories found in 
+# Find all the wolfkrow.core.tasks.task.Task objects we can.
+# Note: Will always search this current directory plus all directories found in
 # the 'WOLFKROW_TASK_SEARCH_PATHS' environment variable.
+#
+# The modules are not imported here. Each one is scanned for the classes it
+# defines (The results are kept in an on disk index until the files change),
+# and is only imported the first time one of its Tasks is looked up in
+# all_tasks. (See task_registry)
 
 from os.path import dirname, basename, isfile, join
 import glob
-modules = glob.glob(join(dirname(__file__), "*.py"))
-ignored_modules = ["__init__.py"]
-__all__ = [ basename(f)[:-3] for f in modules if isfile(f) and basename(f) not in ignored_modules]
+import os
 
-# Search current directory first.
-from . import *
+from .task_registry import TaskIndex, TaskModule, TaskRegistry, get_task_index_file, PACKAGE_NAME
+
+modules = sorted(glob.glob(join(dirname(__file__), "*.py")))
+ignored_modules = ["__init__.py", "task_registry.py"]
+__all__ = [ basename(f)[:-3] for f in modules if isfile(f) and basename(f) not in ignored_modules]
 
 # Search direcotries found in the WOLFKROW_TASK_SEARCH_PATHS.
 # Note: Tasks defined more than once will overwrite and previous definitions found.
 
 PATH_SEP = ":"
 
-import imp
-import os
-search_paths = os.environ.get('WOLFKROW_TASK_SEARCH_PATHS')
-if search_paths:
-    for item in search_paths.split(PATH_SEP):
-        if os.path.isdir(item):
-            files = os.listdir(item)
-            for file_name in files:
-                if file_name.endswith(".py"):
-                    basename = file_name[:-3]
-                    module_name = "wolfkrow.core.tasks.{task_module}".format(
-                        task_module=basename
-                    )
-                    file_path = os.path.join(item, file_name)
-                    imp.load_source(module_name, file_path)
\ No newline at end of file
+
+def _get_module(file_path, class_names):
+    module_name = "{package}.{task_module}".format(
+        package=PACKAGE_NAME,
+        task_module=basename(file_path)[:-3]
+    )
+    return TaskModule(module_name, file_path, class_names)
+
+
+def _find_task_modules():
+    """ Returns the TaskModules for this current directory, followed by the
+        directories found in the 'WOLFKROW_TASK_SEARCH_PATHS' environment variable.
+    """
+    directories = [dirname(__file__)]
+    search_paths = os.environ.get('WOLFKROW_TASK_SEARCH_PATHS')
+    if search_paths:
+        directories.extend(item for item in search_paths.split(PATH_SEP) if os.path.isdir(item))
+
+    task_index = TaskIndex(get_task_index_file())
+    task_modules = []
+    for directory in directories:
+        ignored = ignored_modules if directory == dirname(__file__) else None
+        for file_path, class_names in task_index.scan_directory(directory, ignored=ignored):
+            task_modules.append(_get_module(file_path, class_names))
+    task_index.save()
+
+    return task_modules
+
+
+# Magic dictionary which is automatically populated with ALL wolfkrow.core.tasks.task.Task objects defined.
+# (They only need to be imported -- See task_registry)
+all_tasks = TaskRegistry(_find_task_modules)
@@ -44,7 +44,7 @@ class CommandLine(SequenceTask):
     script = TaskAttribute(required=True, description="The Command to run on the command line.")
     args = TaskAttribute(required=True, attribute_type=list, description="The arguments to the command. Must be supplied as a list.")
 
-    def export_to_command_line(self, job_name, temp_dir=None, deadline=False, export_json=False):
+    def export_to_command_line(self, job_name, temp_dir=None, deadline=False, export_json=False, manifest=None):
         """ Overwrites the default behavior of this method to just recreate 
             the command line script to run from the script and args attributes.
 
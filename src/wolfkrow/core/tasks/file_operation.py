@@ -19,6 +19,9 @@ class FileOperation(Task):
             a trailing slash OR ensure the directory exists ahead of time.
     """
 
+    # File operations are simple enough to run in-process when executing locally.
+    inprocess_safe = True
+
     source = TaskAttribute(default_value="", attribute_type=str)
     destination = TaskAttribute(default_value="", attribute_type=str)
 
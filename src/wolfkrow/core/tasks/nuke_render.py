@@ -16,7 +16,7 @@ from .task_exceptions import TaskValidationException
 from wolfkrow.core.engine.resolver import Resolver
 
 class NukeTask(Task):
-    def export_to_command_line(self, job_name, temp_dir=None, deadline=False, export_json=False):
+    def export_to_command_line(self, job_name, temp_dir=None, deadline=False, export_json=False, manifest=None):
         """ Will generate a `wolfkrow_run_task` command line command to run in 
             order to re-construct and run this task via command line. 
 
@@ -27,6 +27,7 @@ class NukeTask(Task):
             job_name,
             temp_dir=temp_dir,
             deadline=deadline,
+            manifest=manifest,
         )
 
         # Append a "$" to the end of the command so that nuke does not consume 
@@ -153,7 +153,7 @@ class SequenceTask(Task):
         self.name = name
         return tasks
 
-    def export_to_command_line(self, job_name, temp_dir=None, deadline=False):
+    def export_to_command_line(self, job_name=None, temp_dir=None, deadline=False, export_json=True, manifest=None):
         """
         Generates a `wolfkrow_run_task` command line command to run in order to
         re-construct and run this task via command line.
@@ -161,6 +161,9 @@ class SequenceTask(Task):
         Args:
             temp_dir (str): temp directory to write the stand alone Python script to.
             deadline (bool): whether or not to prepare this task for Deadline.
+            export_json (bool): whether or not to write the args to a JSON file.
+            manifest (JobManifest): manifest to add each chunk's args to, instead 
+                of writing a JSON file per chunk.
         """
 
         # We have a framed sequence task, so export the chunked tasks
@@ -169,6 +172,8 @@ class SequenceTask(Task):
             "job_name": job_name,
             "temp_dir": temp_dir, 
             "deadline": deadline,
+            "export_json": export_json,
+            "manifest": manifest,
         }
         exported = self._export_sequence_task(
             export_method_name,
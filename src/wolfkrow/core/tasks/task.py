@@ -14,8 +14,6 @@ import os
 import textwrap
 import traceback
 
-from weakref import WeakKeyDictionary
-
 from wolfkrow.core.engine.resolver import Resolver
 from wolfkrow.core.engine.task_export import TaskExport
 from wolfkrow.core.tasks.task_exceptions import TaskException
@@ -23,6 +21,73 @@ from future.utils import with_metaclass
 
 
 
+class FrozenList(list):
+    """ Immutable list, used for the default values of TaskAttributes. Copies 
+        of a FrozenList are regular (mutable) lists.
+    """
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(
+            "This list is a shared default value and can not be modified. "
+            "Assign a new value instead."
+        )
+
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(list(self), memo)
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+class FrozenDict(dict):
+    """ Immutable dict, used for the default values of TaskAttributes. Copies 
+        of a FrozenDict are regular (mutable) dicts.
+    """
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(
+            "This dict is a shared default value and can not be modified. "
+            "Assign a new value instead."
+        )
+
+    update = setdefault = pop = popitem = clear = _immutable
+    __setitem__ = __delitem__ = __ior__ = _immutable
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+def freeze(value):
+    """ Returns an immutable version of the value. Lists and dicts (including 
+        nested ones) are converted to FrozenLists and FrozenDicts. Other values
+        are returned as is.
+    """
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    elif isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+
+    return value
+
+
+# Key in a Task instances __dict__ of the cache of resolved TaskAttribute values.
+# Maps the attribute name to a (resolver, resolver generation, resolved value) 
+# tuple. (See TaskAttribute._get_resolved)
+RESOLVED_VALUES_KEY = "_resolved_task_attribute_values"
+
+
 class TaskAttribute(object):
     """ A Descriptor Class intended for use with Task Objects. Using these descriptor objects allows us to store metadata about each attribute 
         on a Task, such as what the type should be, and whether or not it should show up as a configurable attribute on the workflow designer.
@@ -45,20 +110,16 @@ class TaskAttribute(object):
                 description (str): Description of this attribute. (Used in the tool tip in the workflow designer.)
         """
 
-        # Must be a WeakKeyDictionary to allow garbage collection to clean up our 
-        # tasks when we are done with them. (Not that this matters because this 
-        # program will typically be short lived, and the memory used by TaskAttribute 
-        # objects will be minimal. Also, Tasks will typically live for the entire 
-        # duration of the program)
-
-        # WARNING: Using the WeakKeyDictionary opens us up to some very hard to 
-        # debug issues. If garbage collection cleans up one of our TaskAttribute 
-        # objects, it will also get removed from this dictionary. If this happens 
-        # while we are iterating through the dictionary, then weird stuff can happen. 
-        # (Meaning don't iterate through this dictionary!)
-        self.data = WeakKeyDictionary()
+        # Name of the attribute on the Task class. Assigned by the TaskType 
+        # metaclass when the Task class is created. The value of the attribute 
+        # for each Task instance is stored in the instances __dict__ under this 
+        # name. (Because TaskAttribute is a data descriptor, the __dict__ entry 
+        # never shadows it.)
+        self.name = None
 
-        self.default_value = default_value
+        # The default value is shared between all instances, so make sure it 
+        # can not be modified. It is copied on the first modification instead.
+        self.default_value = freeze(default_value)
         self.configurable = configurable
         self.attribute_options = attribute_options
         self.attribute_type = attribute_type
@@ -73,19 +134,13 @@ class TaskAttribute(object):
         """
 
         if instance is not None:
-            # default_value is initialized once when a tasks module is imported. 
-            # If default_value is a mutable type (list, dict, etc...), then all 
-            # instances of the task will share the same object, meaning that an 
-            # update to the value of the TaskAttribute will update all instances
-            # of the same Task type.
-            # Create a deepcopy of the default value so we always get a unique 
-            # object
-            data = self.data.get(instance)
+            # default_value is initialized once when a tasks module is imported, 
+            # so all instances of the task share the same object. Mutable default 
+            # values are frozen, so the value must be copied before modifying it. 
+            # (See add_dependency, and update_replacements)
+            data = instance.__dict__.get(self.name)
             if data is None:
-                data = copy.deepcopy(self.default_value)
-                # Also assign it so the next time we retrieve this object, we get 
-                # our copy, rather than a new fresh copy.
-                self.data[instance] = data
+                data = self.default_value
 
             # Only resolve if we:
             #     1. Have data to resolve
@@ -96,7 +151,7 @@ class TaskAttribute(object):
                 and dont_resolve is False 
                 and hasattr(instance, "resolver")
             ):
-                data = self.resolve(instance, data)
+                data = self._get_resolved(instance, data)
 
             return data
         else:
@@ -107,8 +162,7 @@ class TaskAttribute(object):
             return self
 
     def __set__(self, instance, value):
-        """ Setter function. Will set the given value in the data dictionary using 
-            the instance as the key in the dictionary.
+        """ Setter function. Will store the given value on the instance.
         """
 
         # Don't set the value if it is None
@@ -116,7 +170,55 @@ class TaskAttribute(object):
             return
 
         # Set the data for the task_attribute.
-        self.data[instance] = value
+        instance.__dict__[self.name] = value
+
+        # The cached resolved value is now out of date.
+        resolved_values = instance.__dict__.get(RESOLVED_VALUES_KEY)
+        if resolved_values:
+            resolved_values.pop(self.name, None)
+
+    def copy_value(self, instance, other):
+        """ Copies the value of this attribute from one instance to another. 
+            Lists and dicts are shallow copied, so that the two instances can be 
+            modified independently.
+        """
+        value = instance.__dict__.get(self.name)
+        if isinstance(value, (list, dict)):
+            value = copy.copy(value)
+
+        if value is None:
+            other.__dict__.pop(self.name, None)
+        else:
+            other.__dict__[self.name] = value
+
+    def _get_resolved(self, instance, data):
+        """ Returns the resolved value of the data, using the cached value if 
+            the instances resolver has not changed since it was resolved.
+
+            Values which use the resolver token or environment variables are 
+            resolved every time, since they may change between tasks without 
+            the resolver changing. (See Resolver.is_cacheable)
+
+            Note: Lists and dicts are frozen, so that the returned value can not 
+                be used to modify the cached value. Copy it before modifying it.
+        """
+        resolver = instance.resolver
+        resolved_values = instance.__dict__.get(RESOLVED_VALUES_KEY)
+        if resolved_values is None:
+            resolved_values = instance.__dict__[RESOLVED_VALUES_KEY] = {}
+
+        cached = resolved_values.get(self.name)
+        if (cached is not None 
+            and cached[0] is resolver 
+            and cached[1] == resolver.generation
+        ):
+            return cached[2]
+
+        value = freeze(self.resolve(instance, data))
+        if resolver.is_cacheable(data):
+            resolved_values[self.name] = (resolver, resolver.generation, value)
+
+        return value
 
     def resolve(self, instance, value):
         """ Uses the resolver from the Task instance to resolve any replacements
@@ -210,6 +312,7 @@ class TaskType(type):
         for cl in reversed(classObj.__mro__[:-1]):
             for name, attr in list(cl.__dict__.items()):
                 if isinstance(attr, TaskAttribute):
+                    attr.name = name
                     classObj.task_attributes[name] = attr
 
         # Register all tasks to the wolfkrow.core.tasks module.
@@ -243,6 +346,12 @@ class Task(with_metaclass(TaskType, object)):
             Run -- Called immediately after the Setup method is called.
     """
 
+    # Whether or not this task type is safe to run inside the process executing 
+    # the TaskGraph, rather than in its own process. (See TaskGraph.execute_local)
+    # Only enable this for tasks which are thread safe, and do not require a 
+    # special environment to run in. (Ex: DCC tasks such as NukeRender)
+    inprocess_safe = False
+
     name = TaskAttribute(default_value=None, configurable=True, attribute_type=str)
     name_prefix = TaskAttribute(default_value=None, configurable=False, attribute_type=str)
     dependencies = TaskAttribute(default_value=[], configurable=False, attribute_type=list, serialize=False)
@@ -264,6 +373,13 @@ class Task(with_metaclass(TaskType, object)):
         description="whether or not this task is able to be run in Chunks. (Only relevant for Deadline submission.)"
     )
 
+    resources = TaskAttribute(default_value={}, configurable=True, attribute_type=dict, serialize=False,
+        description=('Resources required to run this task locally. Ex: {"cpu": 8, '
+            '"mem_gb": 16, "nuke_license": 1}. The task will only be started once '
+            'these resources are available. (Only relevant for local execution. '
+            'See the "local" section of the settings file.)')
+    )
+
     python_script_executable = TaskAttribute(default_value=None, configurable=True, attribute_type=str, serialize=False)
     python_script_executable_args = TaskAttribute(default_value=None, configurable=True, attribute_type=list, serialize=False)
     command_line_executable = TaskAttribute(default_value=None, configurable=True, attribute_type=str, serialize=False)
@@ -294,12 +410,7 @@ class Task(with_metaclass(TaskType, object)):
         # Build the resolver for future use. Every task should get it's own, and
         # each tasks resolver is responsible for resolving any replacements used
         # within the task.
-        self.resolver = Resolver(
-            self.replacements, 
-            self.resolver_search_paths, 
-            self.path_swap_lookup, 
-            sgtk=self.sgtk
-        )
+        self.resolver = self._create_resolver()
 
         if self.python_script_executable is None:
             self.python_script_executable = os.environ.get("WOLFKROW_DEFAULT_PYTHON_SCRIPT_EXECUTABLE")
@@ -314,6 +425,17 @@ class Task(with_metaclass(TaskType, object)):
             items = os.environ.get("WOLFKROW_DEFAULT_COMMAND_LINE_EXECUTABLE_ARGS", "").split(",")
             self.command_line_executable_args = items
 
+    def _create_resolver(self):
+        """ Creates a Resolver for this task's replacements. """
+        # The resolver needs a reference to the unresolved replacements, so that 
+        # it sees any updates to them. (See update_replacements)
+        return Resolver(
+            Task.replacements.__get__(self, dont_resolve=True), 
+            Task.resolver_search_paths.__get__(self, dont_resolve=True), 
+            self.path_swap_lookup, 
+            sgtk=self.sgtk
+        )
+
     @property
     def full_name(self):
         """ Returns the name of the task. """
@@ -328,18 +450,31 @@ class Task(with_metaclass(TaskType, object)):
         # the dependency next, we will only be updating the copy.
         dependencies = Task.dependencies.__get__(self, dont_resolve=True)
 
-        dependencies.append(task_name)
+        # Assign a new list rather than appending, because the current list may 
+        # be the shared default value.
+        self.dependencies = dependencies + [task_name]
 
     def copy(self):
         """ Creates a copy of itself.
 
-            Note: We cannot use copy.copy because the default implementation of 
-                __copy__ does not copy the value found in each descriptor for the 
-                copied object (Which makes sense if you think about it).
+            Note: The TaskAttribute values are stored in __dict__, so copy.copy 
+                copies them, but list and dict values are also copied so that 
+                the copies can be modified independently. 
         """
         other = copy.copy(self)
-        for task_attribute in self.task_attributes:
-            setattr(other, task_attribute, getattr(self, task_attribute))
+        for task_attribute in self.task_attributes.values():
+            task_attribute.copy_value(self, other)
+
+        # The copy needs its own resolver, for its own replacements. The values 
+        # resolved so far are still valid for the new resolver, so keep them.
+        resolver = self.resolver
+        other.resolver = resolver.copy(Task.replacements.__get__(other, dont_resolve=True))
+
+        resolved_values = {}
+        for name, cached in self.__dict__.get(RESOLVED_VALUES_KEY, {}).items():
+            if cached[0] is resolver and cached[1] == resolver.generation:
+                resolved_values[name] = (other.resolver, other.resolver.generation, cached[2])
+        other.__dict__[RESOLVED_VALUES_KEY] = resolved_values
 
         return other
 
@@ -437,7 +572,7 @@ class Task(with_metaclass(TaskType, object)):
         """
         return attribute_value
 
-    def export_to_command_line(self, job_name=None, temp_dir=None, deadline=False, export_json=True):
+    def export_to_command_line(self, job_name=None, temp_dir=None, deadline=False, export_json=True, manifest=None):
         """
         Generates a `wolfkrow_run_task` command line command to run in order to
         re-construct and run this task via command line.
@@ -447,6 +582,10 @@ class Task(with_metaclass(TaskType, object)):
                 Only used to generate the script's name.
             temp_dir (str): Temp directory to write a BASH script to
             deadline (bool): Whether to prepare this task for Deadline.
+            export_json (bool): Whether to pass the args in a JSON file.
+            manifest (JobManifest): If specified (and exporting to JSON), the 
+                args are added as a record to this manifest instead of being 
+                written to their own JSON file.
         """
         if self.command_line_executable is None:
             raise TaskException(
@@ -474,8 +613,21 @@ class Task(with_metaclass(TaskType, object)):
             task_args_dict[attribute_name] = sanitised_value
 
         task_args = []
+        json_file_path = None
+        manifest_record = None
 
-        if export_json:
+        if export_json and manifest is not None:
+            # Add all the args to the manifest, and pass the manifest path and
+            # record ID in as args.
+            try:
+                manifest_record = manifest.add_record(self.__class__.__name__, task_args_dict)
+            except Exception as exception:
+                raise TaskException(
+                    "Couldn't write args to manifest file: %s - %s"
+                    % (manifest.file_path, exception)
+                )
+
+        elif export_json:
             # If the executable is Wolfkrow, then write all the args to a JSON
             # file and pass the path in as a single arg
             json_file_path = self._get_script_path(
@@ -492,6 +644,7 @@ class Task(with_metaclass(TaskType, object)):
                     % (json_file_path, exception)
                 )
 
+        if export_json:
             start_frame = task_args_dict.get("start_frame")
             end_frame = task_args_dict.get("end_frame")
 
@@ -502,7 +655,11 @@ class Task(with_metaclass(TaskType, object)):
             if end_frame not in (None, "None"):
                 task_args.append("--end_frame \"%s\"" % end_frame)
 
-            task_args.append("--json_args_file \"%s\"" % json_file_path)
+            if manifest_record is not None:
+                task_args.append("--manifest \"%s\"" % manifest.file_path)
+                task_args.append("--manifest_record %s" % manifest_record)
+            else:
+                task_args.append("--json_args_file \"%s\"" % json_file_path)
 
         else:
             # For other executables, pass the args in as "--key value" pairs
@@ -522,7 +679,10 @@ class Task(with_metaclass(TaskType, object)):
             self, 
             executable=self.command_line_executable, 
             executable_args=self.command_line_executable_args,
-            args=arg_str
+            args=arg_str,
+            json_args_file=json_file_path,
+            manifest_file=manifest.file_path if manifest_record is not None else None,
+            manifest_record=manifest_record,
         )
 
         return [exported_task]
@@ -651,7 +811,7 @@ sys.exit(ret)""".format(
 
         return [(self, file_path)]
 
-    def export(self, export_type="Json", temp_dir=None, job_name=None, deadline=False):
+    def export(self, export_type="Json", temp_dir=None, job_name=None, deadline=False, manifest=None):
         """ Will Export this task in order to run later. This is to allow for 
             synchronous execution of many tasks among many machines. Intended 
             to be used alongside a distributed render manager (Something like 
@@ -665,6 +825,8 @@ sys.exit(ret)""".format(
                     Used to choose where to write the python script to.
                 job_name (str): Passed onto the PythonScript export method. 
                     Used to choose the name of the exported python script.
+                manifest (JobManifest): Manifest to add the args to when 
+                    exporting to Json, instead of writing a JSON file per task.
 
             returns:
                 (self, created_obj) - created_obj will either be a command line string to run OR the file path to a python script.
@@ -697,7 +859,8 @@ sys.exit(ret)""".format(
             export_type, 
             temp_dir=self.temp_dir, 
             job_name=job_name, 
-            deadline=deadline
+            deadline=deadline,
+            manifest=manifest,
         )
 
         # Export the parent task.
@@ -707,7 +870,9 @@ sys.exit(ret)""".format(
             )
         elif export_type == "Json":
             exported_tasks.extend(
-                self.export_to_command_line(job_name, temp_dir=self.temp_dir, deadline=deadline, export_json=True)
+                self.export_to_command_line(
+                    job_name, temp_dir=self.temp_dir, deadline=deadline, export_json=True, manifest=manifest
+                )
             )
         elif export_type == "BashScript":
             exported_tasks.extend(self.export_to_bash_script(job_name, temp_dir=self.temp_dir, deadline=deadline))
@@ -715,7 +880,9 @@ sys.exit(ret)""".format(
             exported_tasks.extend(self.export_to_python_script(job_name, temp_dir=self.temp_dir, deadline=deadline))
         elif export_type == "Json":
             exported_tasks.extend(
-                self.export_to_command_line(job_name, temp_dir=self.temp_dir, deadline=deadline, export_json=True)
+                self.export_to_command_line(
+                    job_name, temp_dir=self.temp_dir, deadline=deadline, export_json=True, manifest=manifest
+                )
             )
         else:
             raise TaskException("Unknown export type: {}. Expected one of 'CommandLine', 'BashScript', or 'PythonScript'".format(
@@ -726,7 +893,7 @@ sys.exit(ret)""".format(
         exported_tasks.extend(sub_tasks)
         return exported_tasks
 
-    def export_subtasks(self, export_type, temp_dir=None, job_name=None, deadline=False):
+    def export_subtasks(self, export_type, temp_dir=None, job_name=None, deadline=False, manifest=None):
         all_exported_subtasks = []
         subtasks = self.get_subtasks()
 
@@ -738,7 +905,8 @@ sys.exit(ret)""".format(
                 export_type,
                 temp_dir=temp_dir,
                 #job_name=job_name,
-                deadline=deadline
+                deadline=deadline,
+                manifest=manifest,
             )
             all_exported_subtasks.extend(exported_subtasks)
 
@@ -765,10 +933,14 @@ sys.exit(ret)""".format(
         # the replacements next, we will only be updating the copy.
         replacements = Task.replacements.__get__(self, dont_resolve=True)
 
+        # Assign a new dict rather than updating it, because the current dict 
+        # may be the shared default value.
+        replacements = dict(replacements)
         replacements.update(new_replacements)
+        self.replacements = replacements
 
         # Tell the resolver that our replacements have changed, so that it can re-resolve the replacements.
-        self.resolver.refresh_replacements()
+        self.resolver.refresh_replacements(replacements)
 
     def __repr__(self):
         """ Official string representation of self.
@@ -2,9 +2,12 @@
 """
 
 import errno
+import json
 import logging
 import os
 
+from wolfkrow.core.engine.task_export import TaskExport
+
 from .task import Task, TaskAttribute
 from .sequence_task import SequenceTask
 from .task_exceptions import TaskValidationException
@@ -25,6 +28,10 @@ class TaskGroup(Task):
     For CommandLine export type, the export is a bash command which runs a bash 
     script containing all the grouped tasks exported commands.
 
+    For Json export type, the export is a `wolfkrow_run_task --manifest` command,
+    which runs all the grouped tasks in a single process. (All the grouped tasks 
+    must be run by the same executable as this task.)
+
     """
 
     task_names = TaskAttribute(
@@ -97,6 +104,46 @@ class TaskGroup(Task):
             file_handle.write(export_str)
             file_handle.write("\n\n")
 
+    def _write_manifest_group_file(self, file_handle, exported_tasks):
+        """ Writes tasks exported via the Json method to the file_handle provided,
+        as a manifest which can be run by `wolfkrow_run_task --manifest`.
+
+        Args:
+            file_handle (File): Opened File handle to write to. Calling code is 
+                responsible for cleaning up the file_handle afterwards.
+            exported_tasks (List): A list of all the exported tasks.
+
+        Raises:
+            TaskValidationException: A task cannot be run from a manifest.
+        """
+        for exported_task in exported_tasks:
+            # Only tasks run through wolfkrow_run_task with a JSON args file (or 
+            # a record in a JobManifest) can be added to the manifest. Tasks 
+            # which are run with a different executable need their own process.
+            if ((exported_task.json_args_file is None and exported_task.manifest_record is None)
+                or exported_task.executable != self.command_line_executable
+            ):
+                raise TaskValidationException("Task '{}' cannot be grouped into a manifest. "
+                    "Only tasks exported to a JSON file and run with '{}' are supported.".format(
+                        exported_task.task.full_name, 
+                        self.command_line_executable
+                    )
+                )
+
+            if exported_task.manifest_record is not None:
+                record = {
+                    "task_name": exported_task.task.__class__.__name__,
+                    "manifest": exported_task.manifest_file,
+                    "manifest_record": exported_task.manifest_record,
+                }
+            else:
+                record = {
+                    "task_name": exported_task.task.__class__.__name__,
+                    "json_args_file": exported_task.json_args_file,
+                }
+            file_handle.write(json.dumps(record))
+            file_handle.write("\n")
+
     def _write_group_file(self, export_type, exported_tasks, group_file_path):
         """ Writes all of the exported tasks to a single file which can be executed
         on the farm.
@@ -113,13 +160,15 @@ class TaskGroup(Task):
                 self._write_python_group_file(fh, exported_tasks)
             elif export_type == "CommandLine":
                 self._write_command_line_group_file(fh, exported_tasks)
+            elif export_type == "Json":
+                self._write_manifest_group_file(fh, exported_tasks)
             elif export_type == "BashScript":
                 # TODO: Implement this
                 raise TaskValidationException("Unsupported Export Type received: {}".format(export_type))
             else:
                 raise TaskValidationException("Unsupported Export Type received: {}".format(export_type))
 
-    def export(self, export_type, temp_dir=None, job_name=None, deadline=False):
+    def export(self, export_type, temp_dir=None, job_name=None, deadline=False, manifest=None):
         """ Overrides the default export method to allow it to combine all of the
         tasks configured into a single file which can be executed later on.
 
@@ -132,6 +181,8 @@ class TaskGroup(Task):
                 choose the name of the exported python script.
             deadline (bool): whether or not to prepare the exported tasks for deadline.
                 TODO: This arguement seemingly does nothing... Lets remove it.
+            manifest (JobManifest): Manifest to add the args of the grouped tasks 
+                to when exporting to Json.
         """
         self.validate()
 
@@ -142,9 +193,10 @@ class TaskGroup(Task):
             self.temp_dir = temp_dir
 
         # Initialize the loader so that we can load our tasks from the configuration.
+        # The Loader updates the replacements it is given, so give it a copy.
         loader = Loader(
             config_file_paths=self.config_files,
-            replacements=self.replacements,
+            replacements=dict(self.replacements),
             temp_dir=self.temp_dir,
             sgtk=self.sgtk,
         )
@@ -171,11 +223,17 @@ class TaskGroup(Task):
                 export_type, 
                 temp_dir=temp_dir, 
                 job_name=job_name, 
-                deadline=deadline
+                deadline=deadline,
+                manifest=manifest,
             )
             exported_tasks.extend(exported_tasks_)
 
-        group_path_extension = ".py" if export_type == "PythonScript" else ".bash"
+        if export_type == "PythonScript":
+            group_path_extension = ".py"
+        elif export_type == "Json":
+            group_path_extension = ".jsonl"
+        else:
+            group_path_extension = ".bash"
 
         # Determine the file path to the group output file.
         group_file_path = os.path.join(temp_dir, self.name + group_path_extension)
@@ -188,6 +246,14 @@ class TaskGroup(Task):
             export_command = "bash " + group_file_path
         elif export_type == "PythonScript":
             export_command = group_file_path
+        elif export_type == "Json":
+            task_export = TaskExport(
+                self,
+                executable=self.command_line_executable,
+                executable_args=self.command_line_executable_args,
+                args="--manifest \"{}\"".format(group_file_path),
+            )
+            return [task_export]
         elif export_type == "BashScript":
             # TODO: Implement this
             raise TaskValidationException("Unsupported Export Type received: {}".format(export_type))
@@ -0,0 +1,375 @@
+""" task_registry Module for lazily loading the Task classes available to wolfkrow.
+
+    Importing every task module (and every file found in the
+    'WOLFKROW_TASK_SEARCH_PATHS') up front is slow, and most processes only ever
+    need one or two Tasks. Instead, the source of each module is scanned for the
+    classes it defines, and a module is only imported the first time one of
+    its classes is requested.
+"""
+
+from builtins import object
+import importlib
+import importlib.util
+import json
+import os
+import re
+import sys
+import threading
+
+from wolfkrow.core import utils
+
+# Matches the names of the classes defined at the top level of a module.
+CLASS_PATTERN = re.compile(r"^class\s+(\w+)\s*[\(:]", re.MULTILINE)
+
+PACKAGE_NAME = "wolfkrow.core.tasks"
+
+
+def scan_module_classes(file_path):
+    """ Finds the names of the classes defined at the top level of a python
+        file without importing it.
+
+        Args:
+            file_path (str): Path to the python file to scan.
+
+        Returns:
+            list: Names of the classes defined in the file.
+    """
+    try:
+        with open(file_path, "r") as handle:
+            source = handle.read()
+    except (IOError, OSError, UnicodeDecodeError) as exception:
+        print("Warning: Unable to scan task module {}: {}".format(file_path, exception))
+        return []
+
+    return CLASS_PATTERN.findall(source)
+
+
+
+def get_task_index_file():
+    """ Returns the path to the on disk task discovery index, or None if the index 
+        is disabled.
+
+        The path can be set with the "WOLFKROW_TASK_INDEX_FILE" environment 
+        variable, and the index can be disabled by setting the "WOLFKROW_TASK_INDEX" 
+        environment variable to "0".
+    """
+    if os.environ.get("WOLFKROW_TASK_INDEX", "1") == "0":
+        return None
+
+    index_file = os.environ.get("WOLFKROW_TASK_INDEX_FILE")
+    if not index_file:
+        index_file = os.path.join(os.path.expanduser("~"), ".cache", "wolfkrow", "task_index.json")
+    return index_file
+
+
+class TaskIndex(object):
+    """ On disk index of the classes defined by each python file in the task 
+        directories, so the files only need to be scanned again once they change.
+
+        Directories are only listed again when their modification time changes 
+        (Ex: A file was added or removed), and files are only scanned again when 
+        their modification time or size changes. This keeps discovery down to a 
+        few stat calls on network file systems with many task files.
+    """
+
+    VERSION = 1
+
+    def __init__(self, index_file=None):
+        """ Initializes the TaskIndex object.
+
+            Kwargs:
+                index_file (str): Path to the index file. If not specified, the 
+                    index is only kept in memory.
+        """
+        self.index_file = index_file
+        self._directories = {}
+        self._modified = False
+        self._load()
+
+    def _load(self):
+        if not self.index_file:
+            return
+
+        try:
+            with open(self.index_file, "r") as handle:
+                index = json.load(handle)
+        except (IOError, OSError, ValueError):
+            return
+
+        if isinstance(index, dict) and index.get("version") == self.VERSION:
+            self._directories = index.get("directories") or {}
+
+    def save(self):
+        """ Writes the index to disk, if anything changed since it was loaded. """
+        if not self.index_file or not self._modified:
+            return
+
+        index = {"version": self.VERSION, "directories": self._directories}
+        try:
+            utils.write_file_atomic(
+                self.index_file, 
+                json.dumps(index, sort_keys=True).encode("utf-8")
+            )
+        except (IOError, OSError) as exception:
+            print("Warning: Unable to write the wolfkrow task index {}: {}".format(self.index_file, exception))
+
+        self._modified = False
+
+    def scan_directory(self, directory, ignored=None):
+        """ Finds the python files in the directory, and the classes they define.
+
+            Args:
+                directory (str): The directory to scan.
+
+            Kwargs:
+                ignored (list): File names to skip.
+
+            Returns:
+                list: (file path, list of class names) tuples, sorted by file name.
+        """
+        directory = os.path.abspath(directory)
+        try:
+            directory_mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return []
+
+        entry = self._directories.get(directory)
+        if entry is not None and entry.get("mtime") == directory_mtime:
+            cached_files = entry["files"]
+            file_names = sorted(cached_files)
+        else:
+            cached_files = entry["files"] if entry is not None else {}
+            file_names = sorted(
+                file_name for file_name in os.listdir(directory) 
+                if file_name.endswith(".py")
+            )
+
+        ignored = ignored or []
+        files = {}
+        results = []
+        for file_name in file_names:
+            if file_name in ignored:
+                continue
+
+            file_path = os.path.join(directory, file_name)
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+
+            signature = [stat.st_mtime_ns, stat.st_size]
+            cached = cached_files.get(file_name)
+            if cached is not None and cached.get("signature") == signature:
+                class_names = cached["classes"]
+            else:
+                class_names = scan_module_classes(file_path)
+
+            files[file_name] = {"signature": signature, "classes": class_names}
+            results.append((file_path, class_names))
+
+        if entry is None or entry.get("mtime") != directory_mtime or files != cached_files:
+            self._directories[directory] = {"mtime": directory_mtime, "files": files}
+            self._modified = True
+
+        return results
+
+
+class TaskModule(object):
+    """ A module which may define Tasks, and how to import it. """
+
+    def __init__(self, module_name, file_path, class_names):
+        """ Initializes the TaskModule object.
+
+            Args:
+                module_name (str): Name to import the module as.
+                file_path (str): Path to the python file.
+                class_names (list): Names of the classes defined in the module.
+        """
+        self.module_name = module_name
+        self.file_path = file_path
+        self.class_names = class_names
+        self.loaded = False
+
+    def load(self):
+        """ Imports the module. Modules inside the wolfkrow.core.tasks package are
+            imported normally, while modules from the search paths are loaded
+            directly from their file, under the wolfkrow.core.tasks package name.
+
+            Returns:
+                module: The imported module.
+        """
+        if os.path.dirname(os.path.abspath(self.file_path)) == os.path.dirname(os.path.abspath(__file__)):
+            module = importlib.import_module(self.module_name)
+        else:
+            spec = importlib.util.spec_from_file_location(self.module_name, self.file_path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[self.module_name] = module
+            try:
+                spec.loader.exec_module(module)
+            except Exception:
+                sys.modules.pop(self.module_name, None)
+                raise
+
+        self.loaded = True
+        return module
+
+
+class TaskRegistry(dict):
+    """ Dictionary of Task name => Task class, which imports the module defining
+        a Task the first time it is looked up.
+
+        Tasks register themselves when their class is created (See TaskType), so
+        this dictionary is populated as modules are imported. Looking up a Task
+        which has not been imported yet will import the module which defines it,
+        and iterating over the registry will import all the modules.
+
+        When more than one module defines a Task with the same name, the module
+        found last wins (Modules in the search paths take precedence over the
+        built in modules, and later search paths take precedence over earlier
+        ones). This holds regardless of the order the modules are imported in.
+    """
+
+    def __init__(self, modules_factory):
+        """ Initializes the TaskRegistry object.
+
+            Args:
+                modules_factory (callable): Returns the list of TaskModules, in
+                    order of increasing precedence. Only called the first time
+                    a module needs to be loaded.
+        """
+        super(TaskRegistry, self).__init__()
+        self._modules_factory = modules_factory
+        self._modules = None
+        self._owners = None
+        self._lock = threading.RLock()
+
+    def _get_modules(self):
+        with self._lock:
+            if self._modules is None:
+                modules = self._modules_factory()
+                owners = {}
+                for task_module in modules:
+                    for class_name in task_module.class_names:
+                        owners[class_name] = task_module
+
+                self._modules = modules
+                self._owners = owners
+
+            return self._modules
+
+    @property
+    def manifest(self):
+        """ dict: Task class name => Path to the file it will be loaded from. """
+        self._get_modules()
+        return dict(
+            (class_name, task_module.file_path)
+            for class_name, task_module in self._owners.items()
+        )
+
+    def _load(self, name):
+        """ Imports the module which defines the given Task, if it is not loaded yet.
+
+            Returns:
+                bool: True if a module was imported.
+        """
+        self._get_modules()
+        task_module = self._owners.get(name)
+        if task_module is None or task_module.loaded:
+            return False
+
+        with self._lock:
+            if task_module.loaded:
+                return False
+            self._import(task_module)
+        return True
+
+    def _import(self, task_module):
+        """ Imports the module, and registers its Tasks. Tasks register themselves 
+            as they are created, but a module which was already imported before 
+            this registry was created (Ex: By another module) will not create its 
+            Tasks again, so they are registered here too.
+        """
+        from wolfkrow.core.tasks.task import Task
+
+        module = task_module.load()
+        for class_name in task_module.class_names:
+            task_class = getattr(module, class_name, None)
+            if (isinstance(task_class, type) 
+                and issubclass(task_class, Task) 
+                and task_class is not Task
+                and not dict.__contains__(self, class_name)
+            ):
+                self[class_name] = task_class
+
+    def load_all(self):
+        """ Imports every module which has not been loaded yet. """
+        with self._lock:
+            for task_module in self._get_modules():
+                if not task_module.loaded:
+                    self._import(task_module)
+
+    def _lookup(self, name):
+        # Always make sure the module which owns the name has been imported, even 
+        # if the name is already registered. Another module defining a Task with 
+        # the same name (Ex: A built in module imported by some other module) may 
+        # have registered it first.
+        self._load(name)
+        if not dict.__contains__(self, name):
+            # Classes which are not defined at the top level of a module (Ex:
+            # created dynamically) can not be found by the scan, so fall back
+            # to importing everything.
+            self.load_all()
+
+    def __setitem__(self, name, task_class):
+        # Make sure the module with the highest precedence keeps its Task when
+        # another module defining a Task with the same name is imported after it.
+        self._get_modules()
+        owner = self._owners.get(name)
+        existing = dict.get(self, name)
+        if (owner is not None
+            and existing is not None
+            and existing.__module__ == owner.module_name
+            and task_class.__module__ != owner.module_name
+        ):
+            return
+
+        super(TaskRegistry, self).__setitem__(name, task_class)
+
+    def __getitem__(self, name):
+        self._lookup(name)
+        return super(TaskRegistry, self).__getitem__(name)
+
+    def get(self, name, default=None):
+        self._lookup(name)
+        return super(TaskRegistry, self).get(name, default)
+
+    def __contains__(self, name):
+        self._lookup(name)
+        return super(TaskRegistry, self).__contains__(name)
+
+    def __iter__(self):
+        self.load_all()
+        return super(TaskRegistry, self).__iter__()
+
+    def __len__(self):
+        self.load_all()
+        return super(TaskRegistry, self).__len__()
+
+    def keys(self):
+        self.load_all()
+        return super(TaskRegistry, self).keys()
+
+    def values(self):
+        self.load_all()
+        return super(TaskRegistry, self).values()
+
+    def items(self):
+        self.load_all()
+        return super(TaskRegistry, self).items()
+
+    def copy(self):
+        self.load_all()
+        return dict(super(TaskRegistry, self).items())
+
+    def __repr__(self):
+        return "TaskRegistry(%s)" % super(TaskRegistry, self).__repr__()
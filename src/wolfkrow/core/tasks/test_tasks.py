@@ -1,8 +1,13 @@
 from __future__ import print_function
+import subprocess
+import sys
+
 from wolfkrow.core.tasks import task, sequence_task
 from wolfkrow.core.engine import task_graph
 from . import task_exceptions
 class TestTask_Successful(task.Task):
+    inprocess_safe = True
+
     def __init__(self, **kwargs):
         super(TestTask_Successful, self).__init__(**kwargs)
 
@@ -31,6 +36,8 @@ class TestTask_Failed_Validate(task.Task):
 
 
 class TestTask_Failed_Run(task.Task):
+    inprocess_safe = True
+
     def __init__(self, **kwargs):
         super(TestTask_Failed_Run, self).__init__(**kwargs)
 
@@ -45,6 +52,20 @@ class TestTask_Failed_Run(task.Task):
         raise task_graph.TaskGraphException("Rigged to fail")
 
 
+class TestTask_Child_Output(task.Task):
+    inprocess_safe = True
+
+    def validate(self):
+        return True
+
+    def setup(self):
+        return True
+
+    def run(self):
+        # Writes to stdout from a child process, rather than through sys.stdout.
+        return subprocess.call([sys.executable, "-c", "print('Output from a child process')"])
+
+
 class TestSequence(sequence_task.SequenceTask):
     def validate(self):
         return True
@@ -1,7 +1,15 @@
 from builtins import object
 
+import collections
+import copy
+import glob
+import hashlib
+import json
+import marshal
 import os
 import sys
+import tempfile
+import threading
 import yaml
 
 from importlib import reload
@@ -10,6 +18,11 @@ from types import ModuleType
 class WolfkrowSettings(object):
     """ Simple helper class to simplify getting the settings for wolfkrow. 
 
+    The parsed settings files are cached for the whole process (See load_yaml), 
+    keyed by the resolved path of the file and its modification time, so creating 
+    many WolfkrowSettings (Ex: One per TaskGraph) only parses the file once. Each 
+    WolfkrowSettings still gets its own copy of the settings.
+
     NOTE: The settings are a different file than the wolfkrow.yaml file.
     """
     def __init__(self, settings_file=None):
@@ -33,10 +46,8 @@ class WolfkrowSettings(object):
         # Now load whatever settings file we found.
         self._load_settings()
 
-    def _load_settings(self):
-        with open(self.settings_file, "r") as handle:
-            file_contents = handle.read()
-        settings = yaml.load(file_contents, Loader=yaml.Loader)
+    def _load_settings(self, refresh=False):
+        settings = load_yaml(self.settings_file, refresh=refresh)
         self.settings = settings
 
     def set_settings_file(self, settings_file):
@@ -44,6 +55,267 @@ class WolfkrowSettings(object):
         # Now reload the config
         self._load_settings()
 
+    def reload(self):
+        """ Parses the settings file again, ignoring the cache. Useful in long 
+        running sessions (Ex: A DCC, alongside wolfkrow_reload) where the file 
+        may have been replaced without its modification time changing.
+        """
+        self._load_settings(refresh=True)
+
+
+def fingerprint(value):
+    """ Generates a stable hash of the given value. Useful as a cache key for 
+    values which are not hashable themselves, such as a replacements dictionary.
+
+    Args:
+        value (any): The value to fingerprint. Typically made up of dicts, lists, 
+            and strings. Other types are fingerprinted using their repr.
+
+    Returns:
+        str: Hex digest of the value.
+    """
+    serialized = json.dumps(value, sort_keys=True, default=repr)
+    return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+
+
+class LRUCache(object):
+    """ Simple thread safe least recently used cache, which keeps track of its 
+    hits and misses.
+    """
+
+    def __init__(self, maxsize=128):
+        """ Initializes the LRUCache object.
+
+        Kwargs:
+            maxsize (int): The maximum number of items to keep in the cache.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """ Returns the cached value for the key, or the default if the key is 
+        not in the cache. Counts as a hit or a miss.
+        """
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        """ Adds the value to the cache, evicting the least recently used item 
+        if the cache is full.
+        """
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        """ Removes all the items from the cache, and resets the counters. """
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """ Returns a dict with the hits, misses, maxsize, and current size of the cache. """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "maxsize": self.maxsize,
+                "size": len(self._items),
+            }
+
+    def __len__(self):
+        return len(self._items)
+
+
+# The C based loader is several times faster than the pure python one, but is 
+# only available when PyYAML was built against libyaml.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Parsed yaml files, keyed by (real path, mtime, size).
+_yaml_cache = LRUCache(maxsize=256)
+
+
+def parse_yaml(contents):
+    """ Parses the yaml string using the fastest available safe loader. Falls 
+    back to the full loader for documents using python specific tags.
+
+    Args:
+        contents (str): The yaml document to parse.
+
+    Returns:
+        any: The parsed document.
+    """
+    try:
+        return yaml.load(contents, Loader=YAML_LOADER)
+    except yaml.constructor.ConstructorError:
+        return yaml.load(contents, Loader=yaml.Loader)
+
+
+def get_config_cache_dir():
+    """ Returns the directory used to store the on disk cache of parsed yaml 
+    files, or None if the on disk cache is disabled.
+
+    The directory can be set with the "WOLFKROW_CONFIG_CACHE_DIR" environment 
+    variable, and the on disk cache can be disabled by setting the 
+    "WOLFKROW_CONFIG_CACHE" environment variable to "0".
+    """
+    if os.environ.get("WOLFKROW_CONFIG_CACHE", "1") == "0":
+        return None
+
+    cache_dir = os.environ.get("WOLFKROW_CONFIG_CACHE_DIR")
+    if not cache_dir:
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "wolfkrow", "config")
+    return cache_dir
+
+
+def _get_disk_cache_file(key):
+    cache_dir = get_config_cache_dir()
+    if cache_dir is None:
+        return None
+
+    # The file name starts with a digest of the path, so that the older cache 
+    # files for the same path can be found. (See _write_disk_cache) The marshal 
+    # format is only guaranteed to be compatible with the same version of 
+    # python, so include it as well.
+    path, version = key[0], key[1:]
+    path_digest = hashlib.sha1(repr((path, sys.version)).encode("utf-8")).hexdigest()
+    version_digest = hashlib.sha1(repr(version).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, "{}_{}.marshal".format(path_digest, version_digest))
+
+
+def _read_disk_cache(key):
+    cache_file = _get_disk_cache_file(key)
+    if cache_file is None:
+        return None
+
+    try:
+        with open(cache_file, "rb") as handle:
+            data = handle.read()
+        # Make sure the file is intact before trusting it.
+        marshal.loads(data)
+    except (IOError, OSError, EOFError, ValueError, TypeError):
+        return None
+    return data
+
+
+def write_file_atomic(file_path, data):
+    """ Writes the data to a temp file next to the file path first, and then 
+    moves it into place, so other processes never read a partially written 
+    file. Missing directories are created, readable only by the current user.
+
+    Args:
+        file_path (str): Path to the file to write.
+        data (bytes): The contents of the file.
+    """
+    directory = os.path.dirname(file_path)
+    if not os.path.isdir(directory):
+        os.makedirs(directory, mode=0o700)
+
+    handle, temp_file = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as temp_handle:
+            temp_handle.write(data)
+        os.replace(temp_file, file_path)
+    except Exception:
+        os.remove(temp_file)
+        raise
+
+
+def _write_disk_cache(key, data):
+    cache_file = _get_disk_cache_file(key)
+    if cache_file is None:
+        return
+
+    try:
+        write_file_atomic(cache_file, data)
+    except (IOError, OSError) as exception:
+        print("Warning: Unable to write the wolfkrow config cache {}: {}".format(cache_file, exception))
+        return
+
+    # The file has been modified, so the cache files for its older versions 
+    # will never be read again. Remove them so the cache does not keep growing.
+    cache_dir, file_name = os.path.split(cache_file)
+    path_digest = file_name.split("_", 1)[0]
+    for old_cache_file in glob.glob(os.path.join(cache_dir, path_digest + "_*.marshal")):
+        if old_cache_file == cache_file:
+            continue
+        try:
+            os.remove(old_cache_file)
+        except OSError:
+            pass
+
+
+def load_yaml(path, use_cache=True, refresh=False):
+    """ Loads the yaml file. The parsed result is cached both in memory and on 
+    disk, keyed by the path of the file along with its modification time and 
+    size, so each file only needs to be parsed once until it is modified. Only 
+    the latest version of each file is kept in the on disk cache.
+
+    Args:
+        path (str): Path to the yaml file to load.
+
+    Kwargs:
+        use_cache (bool): Whether or not to use the cache.
+        refresh (bool): Parse the file again even if it is cached, and replace 
+            the cached result.
+
+    Returns:
+        any: The parsed document. A new copy is returned every call, so the 
+            caller is free to modify it.
+    """
+    if not use_cache:
+        with open(path, "r") as handle:
+            return parse_yaml(handle.read())
+
+    stat = os.stat(path)
+    key = (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+
+    cached = None if refresh else _yaml_cache.get(key)
+    if cached is None:
+        data = None if refresh else _read_disk_cache(key)
+        if data is not None:
+            cached = (True, data)
+        else:
+            with open(path, "r") as handle:
+                parsed = parse_yaml(handle.read())
+
+            try:
+                cached = (True, marshal.dumps(parsed))
+                _write_disk_cache(key, cached[1])
+            except ValueError:
+                # The document contains types which marshal does not support (Ex: 
+                # dates), so can only be cached in memory.
+                cached = (False, parsed)
+
+        _yaml_cache.set(key, cached)
+
+    is_marshaled, data = cached
+    if is_marshaled:
+        return marshal.loads(data)
+    return copy.deepcopy(data)
+
+
+def yaml_cache_info():
+    """ Returns the hits, misses, maxsize, and size of the in memory yaml cache. """
+    return _yaml_cache.info()
+
+
+def clear_yaml_cache():
+    """ Clears the in memory yaml cache. The on disk cache is left alone. """
+    _yaml_cache.clear()
+
 
 def wolfkrow_reload(module):
     """ Recursively reload all wolfkrow modules. Intended to be used in development, 
@@ -5,10 +5,16 @@ Module providing the main way to run Wolfkrow jobs from the command line.
 from builtins import zip
 from builtins import range
 import argparse
+import contextlib
 import json
+import socketserver
+import stat
 import sys
 import os
+import traceback
 
+from wolfkrow.core.engine.job_manifest import JobManifest, JobManifestException
+from wolfkrow.core.engine.resolver import Resolver
 from wolfkrow.core.tasks import all_tasks
 
 
@@ -46,6 +52,12 @@ def parse_args():
     In either case, these arguments are passed into a an instance of a Task
     object of the type specified by "--task_name".
 
+    Alternatively, "--serve" starts a long-lived worker instead (See serve), and
+    "--manifest" runs all the tasks in a manifest file. (See run_manifest)
+
+    When "--manifest_record" is passed alongside "--manifest", only that record
+    of a JobManifest is loaded, and used as the task arguments instead.
+
     Returns:
         args, task_args: Namespace containing the expected arguments, and a
             dictionary of any other arguments.
@@ -59,6 +71,29 @@ def parse_args():
         required=False
     )
 
+    parser.add_argument(
+        "--serve",
+        metavar="SOCKET_PATH",
+        help="Run as a long-lived worker which executes the tasks it receives "
+            "on the given UNIX socket path. Use '-' to receive tasks on stdin "
+            "and reply on stdout instead.",
+        required=False
+    )
+
+    parser.add_argument(
+        "--manifest",
+        help="JSONL file containing a task request on each line. The tasks are "
+            "run in order, in this process. (See run_manifest)",
+        required=False
+    )
+
+    parser.add_argument(
+        "--manifest_record",
+        help="ID of the record in the JobManifest passed to --manifest which "
+            "contains the task name and args. Only that task is run.",
+        required=False
+    )
+
     known, unknown = parser.parse_known_args()
 
 
@@ -67,29 +102,12 @@ def parse_args():
     # Load args from a JSON file
     args_file_path = known.json_args_file
     if args_file_path is not None:
-        print("Loading args from JSON file:")
-        print(args_file_path)
-
-        if not os.path.isfile(args_file_path):
-            message = "No such JSON file: %s" % args_file_path
-            _print_and_raise(message)
+        task_args = _load_json_args_file(args_file_path)
 
-        try:
-            with open(args_file_path) as json_file:
-                task_args = json.load(json_file)
-
-        except Exception as exception:
-            message = (
-                "Couldn't load JSON file: %s - %s"
-                % (args_file_path, exception)
-            )
-            _print_and_raise(message)
-
-        if not isinstance(task_args, dict):
-            message = (
-                "JSON data read from %s is not a dictionary" % args_file_path
-            )
-            _print_and_raise(message)
+    # Or from a record in a manifest
+    if known.manifest and known.manifest_record is not None:
+        task_name, task_args = _load_manifest_record(known.manifest, known.manifest_record)
+        known.task_name = known.task_name or task_name
 
     # Overlay any extra args passed in like this:
     #
@@ -103,6 +121,343 @@ def parse_args():
     return known, task_args
 
 
+def _load_json_args_file(args_file_path):
+    """
+    Loads the task arguments from a JSON file.
+
+    Args:
+        args_file_path (str): Path to the JSON file to load.
+
+    Returns:
+        dict: The task arguments.
+    """
+    print("Loading args from JSON file:")
+    print(args_file_path)
+
+    if not os.path.isfile(args_file_path):
+        message = "No such JSON file: %s" % args_file_path
+        _print_and_raise(message)
+
+    try:
+        with open(args_file_path) as json_file:
+            task_args = json.load(json_file)
+
+    except Exception as exception:
+        message = (
+            "Couldn't load JSON file: %s - %s"
+            % (args_file_path, exception)
+        )
+        _print_and_raise(message)
+
+    if not isinstance(task_args, dict):
+        message = (
+            "JSON data read from %s is not a dictionary" % args_file_path
+        )
+        _print_and_raise(message)
+
+    return task_args
+
+
+def _load_manifest_record(manifest_path, record_id):
+    """
+    Loads the task name and arguments from a record in a JobManifest.
+
+    Args:
+        manifest_path (str): Path to the manifest file.
+        record_id (str): ID of the record to load.
+
+    Returns:
+        tuple: The task name, and task arguments (dict).
+    """
+    print("Loading args from manifest record %s:" % record_id)
+    print(manifest_path)
+
+    if not manifest_path or not os.path.isfile(manifest_path):
+        _print_and_raise("No such manifest file: %s" % manifest_path)
+
+    try:
+        record = JobManifest.read_record(manifest_path, record_id)
+    except JobManifestException as exception:
+        _print_and_raise(str(exception))
+
+    task_args = record.get("task_args")
+    if not isinstance(task_args, dict):
+        _print_and_raise(
+            "Manifest record %s in %s does not contain a dictionary of args" 
+            % (record_id, manifest_path)
+        )
+
+    return record.get("task_name"), task_args
+
+
+def _get_returncode(result):
+    """
+    Converts the value returned by a Task into the exit code of the process,
+    the same way sys.exit would.
+    """
+    if result is None:
+        return 0
+
+    if isinstance(result, int):
+        return int(result)
+
+    return 1
+
+
+def run_task(task_name, task_args):
+    """
+    Creates a Task instance from the given arguments + executes it.
+
+    Args:
+        task_name (str): Class name of the task to run.
+        task_args (dict): Arguments to construct the Task with.
+
+    Returns:
+        dict: Structured result of the task, containing the "task_name",
+            "returncode", and "error" (None if no exception was raised).
+    """
+    result = {
+        "task_name": task_name,
+        "returncode": 1,
+        "error": None,
+    }
+
+    task_class = all_tasks.get(task_name)
+    if task_class is None:
+        result["error"] = "Unknown task: %s" % task_name
+        return result
+
+    # This process may run many tasks (See serve and run_manifest), so make sure 
+    # the paths created by the earlier tasks are found.
+    Resolver.clear_path_cache()
+
+    try:
+        # Use the args passed in to construct a Task Object
+        task = task_class.from_dict(task_args)
+
+        # Execute the Task Object.
+        result["returncode"] = _get_returncode(task())
+
+    except Exception as exception:
+        traceback.print_exc()
+        result["error"] = "%s: %s" % (exception.__class__.__name__, exception)
+
+    return result
+
+
+def _run_request(request):
+    """
+    Runs a single task request received by a worker.
+
+    Args:
+        request (dict): Must contain "task_name", and either "task_args" (dict),
+            "json_args_file" (str), or "manifest" (str) and "manifest_record".
+
+    Returns:
+        dict: Structured result of the task. See run_task.
+    """
+    task_name = request.get("task_name")
+
+    try:
+        task_args = request.get("task_args")
+        if task_args is None and request.get("json_args_file"):
+            task_args = _load_json_args_file(request["json_args_file"])
+        elif task_args is None and request.get("manifest_record") is not None:
+            record_task_name, task_args = _load_manifest_record(
+                request.get("manifest"), request["manifest_record"]
+            )
+            task_name = task_name or record_task_name
+
+    except WolfkrowRunTaskException as exception:
+        return {"task_name": task_name, "returncode": 1, "error": str(exception)}
+
+    return run_task(task_name, task_args or {})
+
+
+def _handle_request_line(line):
+    """
+    Parses a single line received by a worker, and runs the task it contains.
+
+    Returns:
+        tuple: (reply dict, whether or not the worker should shut down)
+    """
+    try:
+        request = json.loads(line)
+    except ValueError as exception:
+        return {"returncode": 1, "error": "Invalid request: %s" % exception}, False
+
+    if not isinstance(request, dict):
+        return {"returncode": 1, "error": "Invalid request: Expected a JSON object"}, False
+
+    if request.get("command") == "shutdown":
+        return {"returncode": 0, "error": None}, True
+
+    return _run_request(request), False
+
+
+class _WorkerRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Handles a connection to the worker. Every line received is a JSON task
+    request, and each gets a single line JSON reply.
+    """
+
+    def handle(self):
+        for line in self.rfile:
+            line = line.decode("utf-8").strip()
+            if not line:
+                continue
+
+            reply, shutdown = _handle_request_line(line)
+            self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+            if shutdown:
+                self.server.shutdown_requested = True
+                break
+
+
+def _serve_stdio():
+    """
+    Reads requests from stdin, and writes the replies to stdout. (See serve)
+
+    Anything else written to stdout while the tasks run goes to stderr instead, 
+    so that the replies are the only thing written to stdout. This includes 
+    the output of any child processes the tasks start, so the file descriptor 
+    is redirected, rather than just sys.stdout.
+    """
+    stdout_fd = sys.stdout.fileno()
+    sys.stdout.flush()
+    reply_fd = os.dup(stdout_fd)
+    os.dup2(sys.stderr.fileno(), stdout_fd)
+
+    try:
+        with os.fdopen(reply_fd, "w", closefd=False) as replies:
+            for line in sys.stdin:
+                line = line.strip()
+                if not line:
+                    continue
+
+                with contextlib.redirect_stdout(sys.stderr):
+                    reply, shutdown = _handle_request_line(line)
+
+                replies.write(json.dumps(reply) + "\n")
+                replies.flush()
+
+                if shutdown:
+                    break
+    finally:
+        sys.stdout.flush()
+        os.dup2(reply_fd, stdout_fd)
+        os.close(reply_fd)
+
+
+def serve(address):
+    """
+    Runs as a long-lived worker, executing every task it receives in this
+    interpreter. This avoids paying the interpreter start up and task import
+    costs for every task.
+
+    Requests are JSON objects, one per line, in the form:
+        {"task_name": "FileCopy", "task_args": {...}}
+    or:
+        {"task_name": "FileCopy", "json_args_file": "/path/to/args.json"}
+
+    Every request gets a single line JSON reply. (See run_task)
+    Send {"command": "shutdown"} to stop the worker.
+
+    Args:
+        address (str): Path of the UNIX socket to listen on. If '-', requests
+            are read from stdin, and the replies are written to stdout.
+    """
+    if address == "-":
+        _serve_stdio()
+        return
+
+    if not hasattr(socketserver, "UnixStreamServer"):
+        _print_and_raise("UNIX sockets are not supported on this platform. Use '--serve -' instead.")
+
+    # Only replace a stale socket left behind by a previous worker. Anything
+    # else at the address is most likely a typo, so don't delete it.
+    if os.path.lexists(address):
+        if not stat.S_ISSOCK(os.lstat(address).st_mode):
+            _print_and_raise("Refusing to replace %s, it is not a socket." % address)
+        os.remove(address)
+
+    # The worker will run any task it is sent as the user who started it, so
+    # only that user may connect to the socket.
+    umask = os.umask(0o077)
+    try:
+        server = socketserver.UnixStreamServer(address, _WorkerRequestHandler)
+    finally:
+        os.umask(umask)
+    os.chmod(address, 0o600)
+    server.shutdown_requested = False
+    print("Wolfkrow worker listening on: %s" % address)
+
+    try:
+        while not server.shutdown_requested:
+            server.handle_request()
+    finally:
+        server.server_close()
+        if os.path.exists(address):
+            os.remove(address)
+
+
+def run_manifest(manifest_path):
+    """
+    Runs every task in a manifest file, in order, in this process. All tasks
+    are run, even if an earlier task fails.
+
+    The manifest is a JSONL file, with one task request on each line. Each
+    request is in the same form as the requests received by serve.
+
+    Args:
+        manifest_path (str): Path to the manifest file.
+
+    Returns:
+        list: Structured result for each task in the manifest. (See run_task)
+    """
+    print("Running tasks from manifest:")
+    print(manifest_path)
+
+    if not os.path.isfile(manifest_path):
+        _print_and_raise("No such manifest file: %s" % manifest_path)
+
+    results = []
+    with open(manifest_path) as manifest_file:
+        for line_number, line in enumerate(manifest_file, 1):
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                request = json.loads(line)
+            except ValueError as exception:
+                results.append({
+                    "task_name": None,
+                    "returncode": 1,
+                    "error": "Invalid manifest entry on line %s: %s" % (line_number, exception),
+                })
+                continue
+
+            print("Running task %s: %s" % (line_number, request.get("task_name")))
+            results.append(_run_request(request))
+
+    # Print a summary of the manifest.
+    failed = [result for result in results if result["returncode"] != 0]
+    print("Manifest summary: %s succeeded, %s failed" % (len(results) - len(failed), len(failed)))
+    for result in results:
+        status = "SUCCEEDED" if result["returncode"] == 0 else "FAILED"
+        message = "    {:<9} {} (exit status {})".format(
+            status, result["task_name"], result["returncode"]
+        )
+        if result["error"]:
+            message += " - {}".format(result["error"])
+        print(message)
+
+    return results
+
+
 def main():
     """
     Main entry point for the script.
@@ -110,6 +465,17 @@ def main():
     Parses arguments, creates a Task instance + executes it.
     """
     args, task_args = parse_args()
+
+    if args.serve:
+        serve(args.serve)
+        return 0
+
+    if args.manifest and args.manifest_record is None:
+        results = run_manifest(args.manifest)
+        if any(result["returncode"] != 0 for result in results):
+            return 1
+        return 0
+
     task_class = all_tasks.get(args.task_name)
 
     # Cannot continue if we do know know what task we are meant to be executing.
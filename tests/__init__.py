@@ -0,0 +1,13 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+# Keep the caches wolfkrow writes to disk out of the home directory of whoever 
+# runs the tests. This needs to happen before the test modules are imported, 
+# since the task index is read as soon as the first Task class is created. 
+# (Each test also gets its own cache directory, see WolfkrowTestCase.setUp)
+_cache_dir = tempfile.mkdtemp()
+atexit.register(shutil.rmtree, _cache_dir, True)
+os.environ["WOLFKROW_TASK_INDEX_FILE"] = os.path.join(_cache_dir, "task_index.json")
+os.environ["WOLFKROW_CONFIG_CACHE_DIR"] = os.path.join(_cache_dir, "config")
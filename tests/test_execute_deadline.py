@@ -1,5 +1,9 @@
 import logging
 import os
+import shutil
+import socket
+import tempfile
+import threading
 
 import unittest
 
@@ -13,6 +17,40 @@ from wolfkrow.core import utils
 
 from .wolfkrow_testcase import WolfkrowTestCase
 
+class FakeDeadlineJobs(object):
+    """ Stand in for the Jobs API of a Deadline.DeadlineConnect.DeadlineCon. """
+
+    def __init__(self, failures=None, errors=None, failure_message=None):
+        # Job name => Number of times submitting the job should fail.
+        self.failures = dict(failures or {})
+        # Error message returned by the deadline API when a submission fails.
+        self.failure_message = failure_message or "Error: HTTP Status Code: 503. Service Unavailable"
+        # Job name => Exception to raise the first time the job is submitted.
+        self.errors = dict(errors or {})
+        self.attempts = {}
+        self.submitted = []
+        self._lock = threading.Lock()
+
+    def SubmitJob(self, job_attrs, plugin_attrs):
+        with self._lock:
+            name = job_attrs["Name"]
+            self.attempts[name] = self.attempts.get(name, 0) + 1
+            if name in self.errors:
+                raise self.errors.pop(name)
+            if self.failures.get(name):
+                self.failures[name] -= 1
+                return self.failure_message
+
+            job_id = "job%s" % len(self.submitted)
+            self.submitted.append((job_id, job_attrs, plugin_attrs))
+            return {"_id": job_id, "Props": {"Name": name}}
+
+
+class FakeDeadlineCon(object):
+    def __init__(self, failures=None, errors=None, failure_message=None):
+        self.Jobs = FakeDeadlineJobs(failures=failures, errors=errors, failure_message=failure_message)
+
+
 # TODO: These tests rely on deadline API. We should try and get API stubs in place
 # so we don't need to actually submit jobs to the farm.
 class TestExecuteDeadline(WolfkrowTestCase):
@@ -58,6 +96,188 @@ class TestExecuteDeadline(WolfkrowTestCase):
 
             self.assertEqual(attr_value, test_attrs[attr_key])
 
+    def test_get_additional_job_attrs_cached(self):
+        settings_file = os.path.join(os.path.dirname(__file__), "test_settings.yaml")
+        job = task_graph.TaskGraph(
+            "taskGraphExecuteSuccess",
+            settings_file=settings_file
+        )
+        replacements = {
+            "user": "test_user"
+        }
+        test_attrs = job._get_additional_job_attrs(replacements=replacements, task_type="NukeRender")
+        test_attrs["Group"] = "modified"
+
+        # The second lookup should come from the cache, and be unaffected by 
+        # changes to the first result.
+        cached_attrs = job._get_additional_job_attrs(replacements=dict(replacements), task_type="NukeRender")
+        self.assertEqual(len(job._job_attrs_cache), 1)
+        self.assertEqual(cached_attrs["Limits"], ["nuke"])
+        self.assertEqual(cached_attrs["Group"], "8cores")
+
+        other_attrs = job._get_additional_job_attrs(replacements={"user": "other_user"}, task_type="NukeRender")
+        self.assertEqual(len(job._job_attrs_cache), 2)
+        self.assertEqual(other_attrs["UserName"], "other_user")
+
+    def test_get_filtered_environment(self):
+        job = task_graph.TaskGraph("filteredEnvironment")
+        job._settings = {
+            "deadline": {
+                "environment_inclusion_filters": ["WOLFKROW_TEST_*"],
+                "environment_exclusion_filters": ["*_SECRET"],
+                "environment_inclusion_list": ["WOLFKROW_EXTRA"],
+                "environment_exclusion_list": ["WOLFKROW_TEST_EXCLUDED"],
+            }
+        }
+        test_environment = {
+            "WOLFKROW_TEST_INCLUDED": "1",
+            "WOLFKROW_TEST_SECRET": "2",
+            "WOLFKROW_TEST_EXCLUDED": "3",
+            "WOLFKROW_EXTRA": "4",
+        }
+        for key, value in test_environment.items():
+            os.environ[key] = value
+            self.addCleanup(os.environ.pop, key, None)
+
+        environment = job._get_filtered_environment()
+
+        self.assertEqual(environment, {"WOLFKROW_TEST_INCLUDED": "1", "WOLFKROW_EXTRA": "4"})
+
+    def _get_submission_test_graph(self):
+        job = task_graph.TaskGraph("taskGraphSubmission")
+        t1 = TestTask_Successful(name="Task1", dependencies=[], replacements={})
+        t2 = TestTask_Successful(name="Task2", dependencies=["Task1"], replacements={})
+        t3 = TestTask_Successful(name="Task3", dependencies=["Task2", "Task1"], replacements={})
+        t4 = TestTask_Successful(name="Task4", dependencies=[], replacements={})
+        job.add_tasks([t1, t2, t3, t4])
+        job._settings["deadline"]["submission_retry_delay"] = 0
+        return job
+
+    def test_execute_deadline_fake_connection(self):
+        job = self._get_submission_test_graph()
+        deadline = FakeDeadlineCon()
+
+        deadline_jobs = job.execute_deadline(
+            inherit_environment=False, 
+            deadline_connection=deadline,
+            max_concurrent_submissions=4,
+        )
+
+        self.assertEqual(sorted(deadline_jobs), ["Task1", "Task2", "Task3", "Task4"])
+
+        # Each job must be submitted after its dependencies, and depend on their IDs.
+        submitted = dict((job_attrs["Name"], (job_id, job_attrs)) for job_id, job_attrs, _ in deadline.Jobs.submitted)
+        ids = dict((name, job_id) for name, (job_id, _) in submitted.items())
+        self.assertEqual(submitted["Task1"][1]["JobDependencies"], "")
+        self.assertEqual(submitted["Task2"][1]["JobDependencies"], ids["Task1"])
+        self.assertEqual(
+            sorted(submitted["Task3"][1]["JobDependencies"].split(",")), 
+            sorted([ids["Task1"], ids["Task2"]])
+        )
+        order = [job_attrs["Name"] for _, job_attrs, _ in deadline.Jobs.submitted]
+        self.assertLess(order.index("Task1"), order.index("Task2"))
+        self.assertLess(order.index("Task2"), order.index("Task3"))
+
+    def test_execute_deadline_retry(self):
+        job = self._get_submission_test_graph()
+        job._settings["deadline"]["submission_retries"] = 2
+
+        # Task2 succeeds on its last retry, Task4 never succeeds.
+        deadline = FakeDeadlineCon(failures={"Task2": 2, "Task4": 3})
+        deadline_jobs = job.execute_deadline(inherit_environment=False, deadline_connection=deadline)
+
+        self.assertEqual(sorted(deadline_jobs), ["Task1", "Task2", "Task3"])
+        submitted_names = [job_attrs["Name"] for _, job_attrs, _ in deadline.Jobs.submitted]
+        self.assertNotIn("Task4", submitted_names)
+        self.assertEqual(deadline.Jobs.failures, {"Task2": 0, "Task4": 0})
+
+    def test_execute_deadline_retry_connection_error(self):
+        job = self._get_submission_test_graph()
+
+        # Connection errors are retried.
+        deadline = FakeDeadlineCon(errors={"Task2": ConnectionResetError("Connection reset")})
+        deadline_jobs = job.execute_deadline(inherit_environment=False, deadline_connection=deadline)
+
+        self.assertEqual(sorted(deadline_jobs), ["Task1", "Task2", "Task3", "Task4"])
+        self.assertEqual(deadline.Jobs.attempts["Task2"], 2)
+
+    def test_execute_deadline_permanent_failure(self):
+        job = self._get_submission_test_graph()
+
+        # Errors which will happen again (Ex: A bad plugin) are not retried.
+        deadline = FakeDeadlineCon(
+            failures={"Task2": 1}, 
+            failure_message="Error: HTTP Status Code: 400. Invalid plugin"
+        )
+        deadline_jobs = job.execute_deadline(inherit_environment=False, deadline_connection=deadline)
+
+        self.assertEqual(sorted(deadline_jobs), ["Task1", "Task3", "Task4"])
+        self.assertEqual(deadline.Jobs.attempts["Task2"], 1)
+
+    def test_execute_deadline_timeout(self):
+        job = self._get_submission_test_graph()
+
+        # A submission which timed out may have created the job anyway, so it is 
+        # not retried by default.
+        deadline = FakeDeadlineCon(errors={"Task2": socket.timeout("timed out")})
+        deadline_jobs = job.execute_deadline(inherit_environment=False, deadline_connection=deadline)
+
+        self.assertEqual(sorted(deadline_jobs), ["Task1", "Task3", "Task4"])
+        self.assertEqual(deadline.Jobs.attempts["Task2"], 1)
+
+        job = self._get_submission_test_graph()
+        job._settings["deadline"]["submission_retry_timeouts"] = True
+        deadline = FakeDeadlineCon(errors={"Task2": socket.timeout("timed out")})
+        deadline_jobs = job.execute_deadline(inherit_environment=False, deadline_connection=deadline)
+
+        self.assertEqual(sorted(deadline_jobs), ["Task1", "Task2", "Task3", "Task4"])
+        self.assertEqual(deadline.Jobs.attempts["Task2"], 2)
+
+    def test_execute_deadline_circular_dependencies(self):
+        job = task_graph.TaskGraph("taskGraphCircularSubmission")
+        t1 = TestTask_Successful(name="Task1", dependencies=["Task2"], replacements={})
+        t2 = TestTask_Successful(name="Task2", dependencies=["Task1"], replacements={})
+        t3 = TestTask_Successful(name="Task3", dependencies=[], replacements={})
+        job.add_tasks([t1, t2, t3])
+
+        # Jobs which could never be submitted are an error.
+        deadline = FakeDeadlineCon()
+        with self.assertRaises(task_graph.TaskGraphException) as context:
+            job.execute_deadline(inherit_environment=False, deadline_connection=deadline)
+
+        self.assertIn("Task1", str(context.exception))
+        self.assertEqual(list(deadline.Jobs.attempts), ["Task3"])
+
+    def test_execute_deadline_unexpected_error(self):
+        job = self._get_submission_test_graph()
+
+        # Any other error is not retried, and is raised.
+        deadline = FakeDeadlineCon(errors={"Task2": TypeError("Bad job attributes")})
+        with self.assertRaises(TypeError):
+            job.execute_deadline(inherit_environment=False, deadline_connection=deadline)
+
+        self.assertEqual(deadline.Jobs.attempts["Task2"], 1)
+        self.assertNotIn("Task3", deadline.Jobs.attempts)
+
+    def test_index_exports_by_name(self):
+        job = task_graph.TaskGraph("indexExportsByName")
+        for prefix in ("ShotA", "ShotB"):
+            t1 = TestTask_Successful(name="Task1", dependencies=[], replacements={})
+            t2 = TestTask_Successful(name="Task2", dependencies=["Task1"], replacements={})
+            job.add_tasks([t1, t2], prefix=prefix)
+
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+        exported_tasks = job.export_tasks(temp_dir=temp_dir, deadline=True)
+        exports_by_name = job._index_exports_by_name(exported_tasks)
+
+        self.assertEqual(sorted(exports_by_name), ["Task1", "Task2"])
+        self.assertEqual(
+            [export.task.full_name for export in exports_by_name["Task1"]],
+            ["ShotA_Task1", "ShotB_Task1"]
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -121,5 +121,31 @@ class TestSequenceTask(WolfkrowTestCase):
                 expected_export_count,
             ))
 
+    def test_taskSequenceCopy(self):
+        t1 = TestSequence(
+            name="Task1", 
+            dependencies=["Task0"], 
+            replacements={"root": "/shows/foobar"}, 
+            config_files=["{root}/config.yaml"],
+            start_frame=1, 
+            end_frame=10,
+        )
+        t2 = t1.copy()
+        t2.start_frame = 5
+        t2.add_dependency("Task2")
+        t2.update_replacements({"root": "/shows/other"})
+
+        self.assertEqual(t2.start_frame, 5)
+        self.assertEqual(t2.end_frame, 10)
+        self.assertEqual(t2.dependencies, ["Task0", "Task2"])
+        self.assertEqual(t2.replacements, {"root": "/shows/other"})
+        self.assertEqual(t2.config_files, ["/shows/other/config.yaml"])
+
+        # The original should be unaffected.
+        self.assertEqual(t1.start_frame, 1)
+        self.assertEqual(t1.dependencies, ["Task0"])
+        self.assertEqual(t1.replacements, {"root": "/shows/foobar"})
+        self.assertEqual(t1.config_files, ["/shows/foobar/config.yaml"])
+
 if __name__ == "__main__":
     unittest.main()
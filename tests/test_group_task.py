@@ -1,6 +1,9 @@
 from builtins import str
+import json
 import logging
 import os
+import shutil
+import tempfile
 import unittest
 
 logging.basicConfig(level=logging.DEBUG)
@@ -54,5 +57,29 @@ class TestGroupTask(WolfkrowTestCase):
         # logging.info("Group Task file contents:")
         # logging.info(contents)
 
+    def test_GroupTask_export_json(self):
+        config_path = self.get_test_config_file("test_group_task.wolfkrow.yaml")
+        loader = Loader(
+            config_file_paths=[config_path]
+        )
+        task_graph = loader.parse_workflow("Group_Test_Manifest")
+
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+
+        exported_tasks = task_graph.export_tasks("Json", temp_dir=temp_dir)
+
+        group_export = exported_tasks["Group_Test_Manifest"]
+        self.assertIn("--manifest", group_export.as_list())
+
+        manifest_path = group_export.as_list()[-1]
+        with open(manifest_path, 'r') as fh:
+            records = [json.loads(line) for line in fh]
+
+        self.assertEqual(len(records), 2)
+        for record in records:
+            self.assertEqual(record["task_name"], "TestTask_Successful")
+            self.assertTrue(os.path.isfile(record["json_args_file"]))
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,15 @@
 from __future__ import print_function
+import os
+import shutil
+import stat
+import tempfile
 import unittest
 
+from unittest import mock
+
 from wolfkrow.builder import workflow_builder
+from wolfkrow.core import utils
+from wolfkrow.core.engine import resolver
 
 from .wolfkrow_testcase import WolfkrowTestCase
 
@@ -21,5 +29,104 @@ class TestLoader(WolfkrowTestCase):
         self.assertTrue(task_graph._tasks['test_nuke_render'].command_line_executable_args == ["-t"])
         self.assertTrue(task_graph._tasks['test_nuke_render'].python_script_executable_args == ["-t"])
 
+    def test_path_swap_lookup(self):
+        config_paths = [self.get_test_config_file("test_path_swap.wolfkrow.yaml")]
+        loader = workflow_builder.Loader(config_file_paths=config_paths)
+
+        task_graph = loader.parse_workflow("test_path_swap")
+        task_1 = task_graph._tasks["Path_Swap_Copy_1"]
+        task_2 = task_graph._tasks["Path_Swap_Copy_2"]
+
+        # The lookup is built once, and shared by all the tasks and their resolvers.
+        self.assertIs(task_1.path_swap_lookup, loader.path_swap_lookup)
+        self.assertIs(task_2.path_swap_lookup, loader.path_swap_lookup)
+        self.assertIs(task_1.resolver.path_swap_table, task_2.resolver.path_swap_table)
+        self.assertEqual(
+            sorted(loader.path_swap_lookup), 
+            ["//server/shows", "/Volumes/shows", "/mnt/shows", "S:"]
+        )
+        self.assertEqual(loader.path_swap_lookup["S:"]["linux"], ["/mnt/shows"])
+
+        # The config itself should not be modified.
+        self.assertEqual(loader.config["path_swap"]["shows"]["linux"], "/mnt/shows")
+
+        expected_root = loader.path_swap_lookup["S:"][resolver.SYSTEM][0]
+        self.assertEqual(task_1.source, expected_root + "/foobar/source_1.txt")
+        self.assertEqual(task_2.destination, expected_root + "/foobar/destination_2.txt")
+
+    def test_config_cache(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        cache_dir = os.path.join(temp_dir, "config_cache")
+        os.environ["WOLFKROW_CONFIG_CACHE_DIR"] = cache_dir
+        self.addCleanup(os.environ.pop, "WOLFKROW_CONFIG_CACHE_DIR")
+        utils.clear_yaml_cache()
+
+        config_file = os.path.join(temp_dir, "test_config_cache.yaml")
+        with open(config_file, "w") as handle:
+            handle.write("replacements:\n  SHOW: first\n")
+
+        # The first load parses the file, and writes it to the on disk cache.
+        config = utils.load_yaml(config_file)
+        self.assertEqual(config, {"replacements": {"SHOW": "first"}})
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+        self.assertEqual(stat.S_IMODE(os.stat(cache_dir).st_mode), 0o700)
+
+        # Every load returns a new copy, so changes do not leak into the cache.
+        config["replacements"]["SHOW"] = "modified"
+        self.assertEqual(utils.load_yaml(config_file), {"replacements": {"SHOW": "first"}})
+        self.assertEqual(utils.yaml_cache_info()["hits"], 1)
+
+        # A new process would load it from the on disk cache.
+        utils.clear_yaml_cache()
+        with mock.patch.object(utils, "parse_yaml") as parse_yaml:
+            self.assertEqual(utils.load_yaml(config_file), {"replacements": {"SHOW": "first"}})
+            self.assertFalse(parse_yaml.called)
+
+        # Modifying the file invalidates the cache.
+        with open(config_file, "w") as handle:
+            handle.write("replacements:\n  SHOW: second_show\n")
+        self.assertEqual(utils.load_yaml(config_file), {"replacements": {"SHOW": "second_show"}})
+
+        # Only the latest version of the file is kept in the on disk cache.
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+    def test_loader_config_cache(self):
+        os.environ["WOLFKROW_CONFIG_CACHE"] = "0"
+        self.addCleanup(os.environ.pop, "WOLFKROW_CONFIG_CACHE")
+        utils.clear_yaml_cache()
+
+        # Loading many Loaders with the same config files only parses them once.
+        with mock.patch.object(utils, "parse_yaml", wraps=utils.parse_yaml) as parse_yaml:
+            loaders = [self.get_default_test_loader() for _ in range(5)]
+            for loader in loaders:
+                self.assertTrue(loader.config)
+            self.assertEqual(parse_yaml.call_count, 2)
+
+        self.assertEqual(loaders[0].config, loaders[-1].config)
+        self.assertIsNot(loaders[0].config, loaders[-1].config)
+
+    def test_settings_cache(self):
+        os.environ["WOLFKROW_CONFIG_CACHE"] = "0"
+        self.addCleanup(os.environ.pop, "WOLFKROW_CONFIG_CACHE")
+        utils.clear_yaml_cache()
+
+        settings_file = os.path.join(os.path.dirname(__file__), "test_settings.yaml")
+
+        # The settings file is only parsed once, but each one gets its own copy.
+        with mock.patch.object(utils, "parse_yaml", wraps=utils.parse_yaml) as parse_yaml:
+            settings_managers = [utils.WolfkrowSettings(settings_file) for _ in range(5)]
+            self.assertEqual(parse_yaml.call_count, 1)
+
+            settings_managers[0].settings["deadline"]["port"] = -1
+            self.assertNotEqual(settings_managers[1].settings["deadline"]["port"], -1)
+            self.assertNotEqual(utils.WolfkrowSettings(settings_file).settings["deadline"]["port"], -1)
+
+            # Reloading always parses the file again.
+            settings_managers[0].reload()
+            self.assertEqual(parse_yaml.call_count, 2)
+            self.assertEqual(settings_managers[0].settings, settings_managers[1].settings)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,93 @@
+import threading
+import time
+import unittest
+
+from wolfkrow.core.engine.local_scheduler import LocalScheduler
+
+
+class TestLocalScheduler(unittest.TestCase):
+
+    def test_independent_jobs_run_concurrently(self):
+        # Both jobs must be running at the same time for the barrier to pass.
+        barrier = threading.Barrier(2, timeout=5)
+
+        def job():
+            barrier.wait()
+            return True
+
+        scheduler = LocalScheduler(max_workers=2)
+        scheduler.add_job("a", job)
+        scheduler.add_job("b", job)
+
+        results = scheduler.run()
+        self.assertEqual(results, {"a": True, "b": True})
+
+    def test_dependency_order(self):
+        order = []
+
+        def job(name):
+            def run():
+                order.append(name)
+                return True
+            return run
+
+        scheduler = LocalScheduler(max_workers=4)
+        scheduler.add_job("c", job("c"), dependencies=["b"])
+        scheduler.add_job("b", job("b"), dependencies=["a"])
+        scheduler.add_job("a", job("a"), dependencies=["not_in_scheduler"])
+
+        scheduler.run()
+        self.assertEqual(order, ["a", "b", "c"])
+
+    def test_failed_dependencies_are_skipped(self):
+        ran = []
+
+        def job(name, success=True):
+            def run():
+                ran.append(name)
+                if not success:
+                    raise RuntimeError("Rigged to fail")
+                return True
+            return run
+
+        scheduler = LocalScheduler(max_workers=2)
+        scheduler.add_job("a", job("a", success=False))
+        scheduler.add_job("b", job("b"), dependencies=["a"])
+        scheduler.add_job("c", job("c"), dependencies=["b"])
+        scheduler.add_job("d", job("d"))
+
+        results = scheduler.run()
+        self.assertEqual(results, {"a": False, "b": None, "c": None, "d": True})
+        self.assertEqual(sorted(ran), ["a", "d"])
+
+    def test_resources_limit_concurrency(self):
+        lock = threading.Lock()
+        running = [0]
+        max_running = [0]
+
+        def job():
+            with lock:
+                running[0] += 1
+                max_running[0] = max(max_running[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return True
+
+        scheduler = LocalScheduler(max_workers=4, resources={"nuke_license": 1})
+        for name in ["a", "b", "c"]:
+            scheduler.add_job(name, job, resources={"nuke_license": 1})
+
+        results = scheduler.run()
+        self.assertEqual(results, {"a": True, "b": True, "c": True})
+        self.assertEqual(max_running[0], 1)
+
+    def test_oversized_resource_request_still_runs(self):
+        scheduler = LocalScheduler(max_workers=2, resources={"cpu": 4})
+        scheduler.add_job("a", lambda: True, resources={"cpu": 8, "unlimited": 100})
+
+        self.assertEqual(scheduler.run(), {"a": True})
+
+
+if __name__ == "__main__":
+    unittest.main()
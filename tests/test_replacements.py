@@ -1,8 +1,15 @@
 from __future__ import print_function
 import unittest
 import os
+import shutil
+import tempfile
 
 from wolfkrow.builder import workflow_builder
+from unittest import mock
+
+from wolfkrow.core.engine import resolver as resolver_module
+from wolfkrow.core.engine.resolver import PathCache, PathSwapTable, Resolver
+from wolfkrow.core.tasks.file_copy import FileCopy
 
 from .wolfkrow_testcase import WolfkrowTestCase
 
@@ -19,5 +26,263 @@ class TestReplacements(WolfkrowTestCase):
         test_data_folder = self.get_test_data_file("resolver_test_dir/nested/test_resolver.txt")
         self.assertEqual(os.path.normpath(test_task.destination), os.path.normpath(test_data_folder))
 
+    def test_nested_replacements(self):
+        replacements = {
+            "shot_path": "{seq_path}/{shot}",
+            "seq_path": "{root}/{seq}",
+            "root": "/shows/foobar",
+            "seq": "abc",
+            "shot": "abc_0010",
+            "version": 3,
+            "file_name": "{shot}_v{version:03d}.exr",
+            "outputs": ["{shot_path}/{file_name}", {"root": "{root}"}],
+        }
+        resolver = Resolver(replacements)
+
+        self.assertEqual(resolver.resolved_replacements["shot_path"], "/shows/foobar/abc/abc_0010")
+        self.assertEqual(resolver.resolved_replacements["file_name"], "abc_0010_v003.exr")
+        self.assertEqual(
+            resolver.resolved_replacements["outputs"], 
+            ["/shows/foobar/abc/abc_0010/abc_0010_v003.exr", {"root": "/shows/foobar"}]
+        )
+        self.assertEqual(resolver.resolved_replacements["version"], 3)
+
+        # The original replacements should not be modified.
+        self.assertEqual(replacements["shot_path"], "{seq_path}/{shot}")
+
+    def test_circular_replacements(self):
+        replacements = {
+            "foo": "{bar}",
+            "bar": "{foo}",
+            "recursive": "a{recursive}",
+            "baz": "{qux}/{foo}",
+            "qux": "qux",
+        }
+        resolver = Resolver(replacements)
+
+        self.assertEqual(resolver.resolved_replacements["foo"], "{bar}")
+        self.assertEqual(resolver.resolved_replacements["bar"], "{foo}")
+        self.assertEqual(resolver.resolved_replacements["recursive"], "a{recursive}")
+        self.assertEqual(resolver.resolved_replacements["baz"], "qux/{foo}")
+
+    def test_shared_resolved_replacements(self):
+        Resolver.clear_cache()
+        replacements = {
+            "root": "/shows/foobar",
+            "shot_path": "{root}/abc_0010",
+        }
+
+        resolver_a = Resolver(replacements)
+        resolver_b = Resolver(dict(replacements))
+        self.assertEqual(Resolver.cache_info()["misses"], 1)
+        self.assertEqual(Resolver.cache_info()["hits"], 1)
+        self.assertEqual(resolver_a.resolved_replacements, resolver_b.resolved_replacements)
+
+        # Modifying one resolvers replacements should not affect the other.
+        replacements["root"] = "/shows/other"
+        resolver_a.refresh_replacements()
+        self.assertEqual(resolver_a.resolved_replacements["shot_path"], "/shows/other/abc_0010")
+        self.assertEqual(resolver_b.resolved_replacements["shot_path"], "/shows/foobar/abc_0010")
+        self.assertEqual(Resolver.cache_info()["misses"], 2)
+
+        # A different search path is a different cache entry.
+        Resolver(replacements, search_paths=["/tmp"])
+        self.assertEqual(Resolver.cache_info()["misses"], 3)
+
+        # Lists and dicts in the replacements are not shared between resolvers.
+        replacements["outputs"] = ["{shot_path}/a.exr"]
+        resolver_c = Resolver(replacements)
+        resolver_d = Resolver(replacements)
+        resolver_c.resolved_replacements["outputs"].append("/b.exr")
+        self.assertEqual(resolver_d.resolved_replacements["outputs"], ["/shows/other/abc_0010/a.exr"])
+        self.assertEqual(Resolver(replacements).resolved_replacements["outputs"], ["/shows/other/abc_0010/a.exr"])
+
+        # Replacements which use the resolver token, or an sgtk instance, are 
+        # never cached.
+        info = Resolver.cache_info()
+        Resolver({"path": "#resolver/found.txt"}, search_paths=["/tmp"])
+        Resolver({"path": "#resolver/found.txt"}, search_paths=["/tmp"])
+        Resolver(replacements, sgtk=object())
+        self.assertEqual(Resolver.cache_info()["hits"], info["hits"])
+        self.assertEqual(Resolver.cache_info()["misses"], info["misses"])
+
+    def test_resolve_values(self):
+        os.environ["WOLFKROW_TEST_REPLACEMENT"] = "shot"
+        self.addCleanup(os.environ.pop, "WOLFKROW_TEST_REPLACEMENT", None)
+
+        resolver = Resolver({"shot": "abc_0010", "version": 3})
+        year = Resolver.TIME.strftime("%Y")
+
+        self.assertEqual(resolver.resolve("{shot}_v{version:03d}"), "abc_0010_v003")
+        self.assertEqual(resolver.resolve("{$WOLFKROW_TEST_REPLACEMENT}"), "abc_0010")
+        self.assertEqual(resolver.resolve("DATE<%Y>/{shot}"), year + "/abc_0010")
+        self.assertEqual(resolver.resolve("{missing:>4}/{shot!r}"), "{missing:>4}/'abc_0010'")
+        self.assertEqual(resolver.resolve("{{shot}}"), "{shot}")
+        self.assertEqual(resolver.resolve("no replacements"), "no replacements")
+        self.assertRaises(ValueError, resolver.resolve, "{shot")
+
+    def test_cached_attribute_values(self):
+        task = FileCopy(
+            name="FileCopy", 
+            source="{root}/source.txt", 
+            destination="{root}/destination.txt",
+            config_files=["{root}/config.yaml"],
+            replacements={"root": "/shows/foobar"},
+        )
+        self.assertEqual(task.source, "/shows/foobar/source.txt")
+        self.assertEqual(task.source, "/shows/foobar/source.txt")
+
+        # Updating the replacements should invalidate the cached values.
+        task.update_replacements({"root": "/shows/other"})
+        self.assertEqual(task.source, "/shows/other/source.txt")
+
+        # So should setting the value.
+        task.source = "{root}/new_source.txt"
+        self.assertEqual(task.source, "/shows/other/new_source.txt")
+        self.assertEqual(task.destination, "/shows/other/destination.txt")
+
+        # The returned value can not be used to modify the cached value.
+        self.assertRaises(TypeError, task.config_files.append, "/extra.yaml")
+        self.assertIs(task.config_files, task.config_files)
+        self.assertEqual(task.config_files, ["/shows/other/config.yaml"])
+
+    def test_uncached_attribute_values(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+
+        os.environ["WOLFKROW_TEST_ROOT"] = "/shows/foobar"
+        self.addCleanup(os.environ.pop, "WOLFKROW_TEST_ROOT", None)
+
+        task = FileCopy(
+            name="FileCopy", 
+            source="#resolver/source.txt", 
+            destination="$WOLFKROW_TEST_ROOT/destination.txt",
+            resolver_search_paths=[temp_dir],
+            replacements={},
+        )
+        self.assertEqual(task.source, "#resolver/source.txt")
+        self.assertEqual(task.destination, "/shows/foobar/destination.txt")
+
+        # Values using the resolver token or environment variables are resolved 
+        # again every time, so files created by an earlier task and changes to 
+        # the environment are picked up. (The path cache is cleared between 
+        # tasks, see Resolver.clear_path_cache)
+        with open(os.path.join(temp_dir, "source.txt"), "w") as handle:
+            handle.write("")
+        os.environ["WOLFKROW_TEST_ROOT"] = "/shows/other"
+        Resolver.clear_path_cache()
+
+        self.assertEqual(task.source, os.path.join(temp_dir, "source.txt"))
+        self.assertEqual(task.destination, "/shows/other/destination.txt")
+
+    def test_shared_default_values(self):
+        task_a = FileCopy(name="TaskA", replacements={})
+        task_b = FileCopy(name="TaskB", replacements={})
+
+        # Default values are shared, and can not be modified in place.
+        self.assertIs(task_a.dependencies, task_b.dependencies)
+        self.assertRaises(TypeError, task_a.dependencies.append, "Task0")
+
+        # They are copied when modified through the Task.
+        task_a.add_dependency("Task0")
+        task_a.update_replacements({"root": "/shows/foobar"})
+        self.assertEqual(task_a.dependencies, ["Task0"])
+        self.assertEqual(task_b.dependencies, [])
+        self.assertEqual(task_a.replacements, {"root": "/shows/foobar"})
+        self.assertEqual(task_b.replacements, {})
+
+    def test_path_cache(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+        search_path_a = os.path.join(temp_dir, "a")
+        search_path_b = os.path.join(temp_dir, "b")
+        os.makedirs(search_path_a)
+        os.makedirs(search_path_b)
+        with open(os.path.join(search_path_b, "found.txt"), "w") as handle:
+            handle.write("")
+
+        for prescan in (False, True):
+            path_cache = PathCache(ttl=30, negative_ttl=30, prescan=prescan)
+            patcher = mock.patch.object(resolver_module, "_path_cache", path_cache)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+            resolver = Resolver({}, search_paths=[search_path_a, search_path_b])
+            expected = os.path.join(search_path_b, "found.txt")
+            self.assertEqual(resolver.resolve("#resolver/found.txt"), expected)
+            self.assertEqual(Resolver.path_cache_info()["misses"], 2)
+
+            # The second time, both search paths should come from the cache.
+            self.assertEqual(resolver.resolve("#resolver/found.txt"), expected)
+            self.assertEqual(Resolver.path_cache_info()["hits"], 2)
+
+            # A file which is created later is not found until the cache expires, 
+            # or is cleared.
+            created = os.path.join(search_path_a, "found.txt")
+            with open(created, "w") as handle:
+                handle.write("")
+            self.assertEqual(resolver.resolve("#resolver/found.txt"), expected)
+
+            Resolver.clear_path_cache()
+            self.assertEqual(resolver.resolve("#resolver/found.txt"), created)
+
+            # A file which is removed is still found until the cache expires.
+            os.remove(created)
+            self.assertEqual(resolver.resolve("#resolver/found.txt"), created)
+
+            patcher.stop()
+
+        # Paths which do not exist are not cached when the negative TTL is 0.
+        with mock.patch.object(resolver_module, "_path_cache", PathCache(ttl=30, negative_ttl=0)):
+            self.assertEqual(resolver.resolve("#resolver/found.txt"), expected)
+            with open(created, "w") as handle:
+                handle.write("")
+            self.assertEqual(resolver.resolve("#resolver/found.txt"), created)
+            os.remove(created)
+
+        # Nothing is cached when the TTL is 0.
+        with mock.patch.object(resolver_module, "_path_cache", PathCache(ttl=0)):
+            self.assertEqual(resolver.resolve("#resolver/found.txt"), expected)
+            self.assertEqual(Resolver.path_cache_info()["size"], 0)
+
+        # The environment is only read when the cache is created.
+        os.environ["WOLFKROW_RESOLVER_PATH_CACHE_TTL"] = "10"
+        os.environ["WOLFKROW_RESOLVER_PATH_CACHE_NEGATIVE_TTL"] = "1"
+        os.environ["WOLFKROW_RESOLVER_PRESCAN"] = "1"
+        for name in ("TTL", "NEGATIVE_TTL"):
+            self.addCleanup(os.environ.pop, "WOLFKROW_RESOLVER_PATH_CACHE_" + name, None)
+        self.addCleanup(os.environ.pop, "WOLFKROW_RESOLVER_PRESCAN", None)
+        path_cache = PathCache()
+        self.assertEqual((path_cache.ttl, path_cache.negative_ttl, path_cache.prescan), (10, 1, True))
+
+    def test_path_swap(self):
+        shows = {"linux": ["/mnt/shows"], "windows": ["S:", "//server/shows"]}
+        show_assets = {"linux": ["/mnt/shows/assets"], "windows": ["A:"]}
+        path_swap_lookup = {
+            "/mnt/shows": shows,
+            "S:": shows,
+            "//server/shows": shows,
+            "/mnt/shows/assets": show_assets,
+            "A:": show_assets,
+        }
+
+        table = PathSwapTable.compile(path_swap_lookup, system="Windows")
+        self.assertEqual(table.swap("/mnt/shows/foobar/plate.exr"), "S:/foobar/plate.exr")
+        self.assertEqual(table.swap("//server/shows/foobar"), "//server/shows/foobar")
+        self.assertEqual(table.swap("/mnt/shows/assets/tree.abc"), "A:/tree.abc")
+        self.assertEqual(table.swap("in=/mnt/shows out=/mnt/shows/x"), "in=S: out=S:/x")
+
+        # Only paths starting and ending on a path boundary are swapped.
+        self.assertEqual(table.swap("/mnt/shows2/foobar"), "/mnt/shows2/foobar")
+        self.assertEqual(table.swap("/data/mnt/shows/foobar"), "/data/mnt/shows/foobar")
+
+        table = PathSwapTable.compile(path_swap_lookup, system="Linux")
+        self.assertEqual(table.swap("S:/foobar/plate.exr"), "/mnt/shows/foobar/plate.exr")
+        self.assertEqual(table.swap("//server/shows/foobar"), "/mnt/shows/foobar")
+        self.assertEqual(table.swap("A:/tree.abc"), "/mnt/shows/assets/tree.abc")
+        self.assertEqual(table.swap("BS:/foobar"), "BS:/foobar")
+
+        self.assertIsNone(PathSwapTable.compile({}))
+
 if __name__ == "__main__":
     unittest.main()
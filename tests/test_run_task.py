@@ -0,0 +1,184 @@
+import json
+import os
+import shutil
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from unittest import mock
+
+from wolfkrow.core.engine.job_manifest import JobManifest, JobManifestException
+from wolfkrow.scripts import wolfkrow_run_task
+
+from .wolfkrow_testcase import WolfkrowTestCase
+
+
+class TestRunTask(WolfkrowTestCase):
+
+    def test_run_task(self):
+        result = wolfkrow_run_task.run_task("TestTask_Successful", {"name": "Task1", "replacements": {}})
+        self.assertEqual(result["returncode"], 0)
+        self.assertIsNone(result["error"])
+
+        result = wolfkrow_run_task.run_task("TestTask_Failed_Run", {"name": "Task2", "replacements": {}})
+        self.assertEqual(result["returncode"], 1)
+
+        result = wolfkrow_run_task.run_task("NotATask", {})
+        self.assertEqual(result["returncode"], 1)
+        self.assertIn("NotATask", result["error"])
+
+    def test_run_task_clears_path_cache(self):
+        # Paths created by earlier tasks run in the same process must be found.
+        with mock.patch.object(wolfkrow_run_task.Resolver, "clear_path_cache") as clear_path_cache:
+            wolfkrow_run_task.run_task("TestTask_Successful", {"name": "Task1", "replacements": {}})
+        clear_path_cache.assert_called_once_with()
+
+    def test_run_manifest(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+
+        manifest_path = os.path.join(temp_dir, "test_manifest.jsonl")
+        with open(manifest_path, "w") as manifest_file:
+            manifest_file.write(json.dumps(
+                {"task_name": "TestTask_Failed_Run", "task_args": {"name": "Task1", "replacements": {}}}
+            ) + "\n")
+            manifest_file.write(json.dumps(
+                {"task_name": "TestTask_Successful", "task_args": {"name": "Task2", "replacements": {}}}
+            ) + "\n")
+
+        results = wolfkrow_run_task.run_manifest(manifest_path)
+
+        # The second task still runs, even though the first one failed.
+        self.assertEqual([result["returncode"] for result in results], [1, 0])
+
+    def test_run_manifest_record(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+
+        manifest_path = os.path.join(temp_dir, "test_manifest.jsonl")
+        with JobManifest(manifest_path) as manifest:
+            failed_id = manifest.add_record("TestTask_Failed_Run", {"name": "Task1", "replacements": {}})
+            successful_id = manifest.add_record("TestTask_Successful", {"name": "Task2", "replacements": {}})
+
+        # Each record is read straight from its offset.
+        record = JobManifest.read_record(manifest_path, successful_id)
+        self.assertEqual(record["task_name"], "TestTask_Successful")
+        self.assertEqual(record["task_args"], {"name": "Task2", "replacements": {}})
+        with self.assertRaises(JobManifestException):
+            JobManifest.read_record(manifest_path, successful_id + 1)
+
+        # Extra args passed on the command line are overlaid on the record's args.
+        argv = [
+            "wolfkrow_run_task", 
+            "--manifest", manifest_path, 
+            "--manifest_record", str(successful_id),
+            "--start_frame", "5",
+        ]
+        with mock.patch.object(sys, "argv", argv):
+            args, task_args = wolfkrow_run_task.parse_args()
+        self.assertEqual(args.task_name, "TestTask_Successful")
+        self.assertEqual(task_args, {"name": "Task2", "replacements": {}, "start_frame": "5"})
+
+        result = wolfkrow_run_task._run_request({"manifest": manifest_path, "manifest_record": failed_id})
+        self.assertEqual(result["task_name"], "TestTask_Failed_Run")
+        self.assertEqual(result["returncode"], 1)
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "UNIX sockets not supported")
+    def test_serve(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+
+        socket_path = os.path.join(temp_dir, "worker.sock")
+
+        # A stale socket left behind by a previous worker is replaced.
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+
+        worker = threading.Thread(target=wolfkrow_run_task.serve, args=(socket_path,))
+        worker.daemon = True
+        worker.start()
+
+        # Wait for the worker to start listening.
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        for _ in range(100):
+            try:
+                client.connect(socket_path)
+                break
+            except OSError:
+                time.sleep(0.05)
+
+        requests = [
+            {"task_name": "TestTask_Successful", "task_args": {"name": "Task1", "replacements": {}}},
+            {"task_name": "TestTask_Failed_Run", "task_args": {"name": "Task2", "replacements": {}}},
+            {"command": "shutdown"},
+        ]
+
+        # Only the user running the worker may connect to it.
+        self.assertEqual(stat.S_IMODE(os.stat(socket_path).st_mode), 0o600)
+
+        with client.makefile("rw") as stream:
+            replies = []
+            for request in requests:
+                stream.write(json.dumps(request) + "\n")
+                stream.flush()
+                replies.append(json.loads(stream.readline()))
+        client.close()
+
+        worker.join(5)
+        self.assertFalse(worker.is_alive())
+
+        self.assertEqual(replies[0]["returncode"], 0)
+        self.assertEqual(replies[1]["returncode"], 1)
+        self.assertEqual(replies[2]["returncode"], 0)
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "UNIX sockets not supported")
+    def test_serve_existing_file(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+
+        # A file which is not a socket is never deleted.
+        file_path = os.path.join(temp_dir, "not_a_socket.txt")
+        with open(file_path, "w") as handle:
+            handle.write("keep me")
+
+        with self.assertRaises(wolfkrow_run_task.WolfkrowRunTaskException):
+            wolfkrow_run_task.serve(file_path)
+
+        with open(file_path) as handle:
+            self.assertEqual(handle.read(), "keep me")
+
+    def test_serve_stdio(self):
+        requests = [
+            {"task_name": "TestTask_Child_Output", "task_args": {"name": "Task1", "replacements": {}}},
+            {"task_name": "TestTask_Successful", "task_args": {"name": "Task2", "replacements": {}}},
+            {"command": "shutdown"},
+        ]
+
+        process = subprocess.Popen(
+            [sys.executable, "-m", "wolfkrow.scripts.wolfkrow_run_task", "--serve", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        stdout, stderr = process.communicate(
+            "".join(json.dumps(request) + "\n" for request in requests), 
+            timeout=60
+        )
+        self.assertEqual(process.returncode, 0, stderr)
+
+        # The output of the task's child process goes to stderr, so stdout 
+        # only contains the replies.
+        replies = [json.loads(line) for line in stdout.splitlines()]
+        self.assertEqual([reply["returncode"] for reply in replies], [0, 0, 0])
+        self.assertIn("Output from a child process", stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
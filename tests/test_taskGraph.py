@@ -1,11 +1,19 @@
 from __future__ import print_function
+import asyncio
 import logging
+import os
+import shutil
+import sys
+import tempfile
 import traceback
 
 logging.basicConfig(level=logging.DEBUG)
 from wolfkrow.builder import workflow_builder
 from wolfkrow.core.tasks import task
 from wolfkrow.core.engine import task_graph
+from wolfkrow.core.engine.job_manifest import JobManifest
+from wolfkrow.core.engine.task_result import TaskResult
+from wolfkrow.core.tasks.command_line import CommandLine
 from wolfkrow.core.tasks.file_copy import FileCopy
 from wolfkrow.core.tasks import task_exceptions
 from wolfkrow.core.tasks.test_tasks import *
@@ -70,5 +78,187 @@ class TestTaskGraph(WolfkrowTestCase):
         job.add_task(t4)
         job.add_task(t5)
 
-        job.execute_local()
+        results = job.execute_local()
+
+        self.assertTrue(results["Task1"])
+        self.assertTrue(results["Task2"])
+        self.assertFalse(results["Task3"])
+        self.assertIsNone(results["Task4"])
+        self.assertTrue(results["Task5"])
+
+    def test_taskGraphExecuteInProcess(self):
+        job = task_graph.TaskGraph("taskGraphExecuteInProcess")
+        t1 = TestTask_Successful(name="Task1", dependencies=[], replacements={})
+        t2 = TestTask_Failed_Run(name="Task2", dependencies=["Task1"], replacements={})
+        t3 = TestTask_Successful(name="Task3", dependencies=["Task2"], replacements={})
+        job.add_tasks([t1, t2, t3])
+
+        results = job.execute_local(mode="inprocess")
+
+        self.assertEqual(results, {"Task1": True, "Task2": False, "Task3": None})
+
+    def test_taskGraphExecuteAsync(self):
+        job = task_graph.TaskGraph("taskGraphExecuteAsync")
+        t1 = TestTask_Successful(name="Task1", dependencies=[], replacements={})
+        t2 = TestTask_Failed_Run(name="Task2", dependencies=["Task1"], replacements={})
+        t3 = TestTask_Successful(name="Task3", dependencies=["Task2"], replacements={})
+        t4 = TestTask_Successful(name="Task4", dependencies=[], replacements={})
+        job.add_tasks([t1, t2, t3, t4])
+
+        streamed = []
+        def output_callback(task_name, stream_name, line):
+            streamed.append((task_name, stream_name, line))
+
+        results = asyncio.run(job.execute_async(output_callback=output_callback))
+
+        self.assertEqual(results["Task1"].status, TaskResult.SUCCEEDED)
+        self.assertEqual(results["Task1"].returncode, 0)
+        self.assertEqual(results["Task2"].status, TaskResult.FAILED)
+        self.assertIn("Rigged to fail", results["Task2"].stderr)
+        self.assertEqual(results["Task3"].status, TaskResult.SKIPPED)
+        self.assertEqual(results["Task4"].status, TaskResult.SUCCEEDED)
+
+        # The output should have been streamed as well as captured.
+        self.assertIn(("Task2", "stderr"), [(name, stream) for name, stream, line in streamed])
+
+    def test_taskGraphExecuteAsyncMissingExecutable(self):
+        job = task_graph.TaskGraph("taskGraphExecuteAsyncMissingExecutable")
+        t1 = TestTask_Successful(
+            name="Task1", dependencies=[], replacements={}, command_line_executable="/no/such/exe"
+        )
+        t2 = TestTask_Successful(name="Task2", dependencies=["Task1"], replacements={})
+        job.add_tasks([t1, t2])
+
+        results = asyncio.run(job.execute_async())
+
+        # A task which could not be started is reported as failed, not skipped.
+        self.assertEqual(results["Task1"].status, TaskResult.FAILED)
+        self.assertIn("/no/such/exe", results["Task1"].stderr)
+        self.assertEqual(results["Task2"].status, TaskResult.SKIPPED)
+
+    def test_taskGraphExecuteAsyncCallbackError(self):
+        job = task_graph.TaskGraph("taskGraphExecuteAsyncCallbackError")
+        t1 = TestTask_Failed_Run(name="Task1", dependencies=[], replacements={})
+        job.add_tasks([t1])
+
+        def output_callback(task_name, stream_name, line):
+            raise RuntimeError("Callback is rigged to fail")
+
+        results = asyncio.run(job.execute_async(output_callback=output_callback))
+
+        self.assertEqual(results["Task1"].status, TaskResult.FAILED)
+        self.assertIn("Callback is rigged to fail", results["Task1"].stderr)
+
+    def test_taskGraphExecuteAsyncLongLine(self):
+        job = task_graph.TaskGraph("taskGraphExecuteAsyncLongLine")
+        t1 = CommandLine(
+            name="Task1", 
+            dependencies=[], 
+            replacements={}, 
+            script=sys.executable, 
+            args=["-c", "print('a' * 200000); print('b')"],
+        )
+        job.add_tasks([t1])
+
+        results = asyncio.run(job.execute_async())
+
+        # Lines longer than the limit of the StreamReader are still read.
+        self.assertEqual(results["Task1"].status, TaskResult.SUCCEEDED)
+        self.assertEqual(results["Task1"].stdout, "a" * 200000 + "\nb")
+
+    def test_taskGraphExportChunkedDependencies(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+
+        job = task_graph.TaskGraph("taskGraphExportChunkedDependencies")
+        t1 = TestSequence(name="Task1", dependencies=[], replacements={}, start_frame=1, end_frame=20, chunk_size=5)
+        t2 = TestTask_Successful(name="Task2", dependencies=["Task1"], replacements={})
+        t3 = TestTask_Successful(name="Task3", dependencies=[], replacements={})
+        job.add_tasks([t1, t2, t3])
+
+        self.assertEqual([task.name for task in job.get_dependents("Task1")], ["Task2"])
+
+        exported_tasks = job.export_tasks(temp_dir=temp_dir)
+        chunk_names = ["Task1_1-5", "Task1_6-10", "Task1_11-15", "Task1_16-20"]
+        for chunk_name in chunk_names:
+            self.assertIn(chunk_name, exported_tasks)
+
+        # The dependent task should now wait on every extra chunk, and each extra 
+        # chunk should depend on the original task.
+        self.assertEqual(t2.dependencies, ["Task1"] + chunk_names[1:])
+        for chunk_name in chunk_names[1:]:
+            self.assertEqual(job._tasks[chunk_name].dependencies, ["Task1"])
+        self.assertEqual(t1.dependencies, [])
+        self.assertEqual(t3.dependencies, [])
+
+    def test_taskGraphExportParallel(self):
+        def create_task_graph():
+            job = task_graph.TaskGraph("taskGraphExportParallel")
+            tasks = []
+            for index in range(1, 6):
+                tasks.append(TestSequence(
+                    name="Sequence%s" % index, 
+                    dependencies=["Sequence%s" % (index - 1)] if index > 1 else [], 
+                    replacements={}, 
+                    start_frame=1, 
+                    end_frame=10 * index, 
+                    chunk_size=5
+                ))
+                tasks.append(TestTask_Successful(
+                    name="Task%s" % index, dependencies=["Sequence%s" % index], replacements={}
+                ))
+            job.add_tasks(tasks)
+            return job
+
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+
+        serial_job = create_task_graph()
+        serial_exports = serial_job.export_tasks(temp_dir=temp_dir, max_workers=1)
+        parallel_job = create_task_graph()
+        parallel_exports = parallel_job.export_tasks(temp_dir=temp_dir, max_workers=8)
+
+        # Exporting in parallel gives exactly the same result as exporting serially.
+        self.assertEqual(list(parallel_exports), list(serial_exports))
+        self.assertEqual(list(parallel_job._tasks), list(serial_job._tasks))
+        for name, task in serial_job._tasks.items():
+            self.assertEqual(parallel_job._tasks[name].dependencies, task.dependencies)
+        self.assertEqual(sorted(parallel_job._graph.edges()), sorted(serial_job._graph.edges()))
+
+    def test_taskGraphExportParallelFailure(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+
+        job = task_graph.TaskGraph("taskGraphExportParallelFailure")
+        t1 = TestTask_Successful(name="Task1", dependencies=[], replacements={})
+        t2 = TestTask_Failed_Validate(name="Task2", dependencies=[], replacements={})
+        job.add_tasks([t1, t2])
+
+        # Exceptions raised by an export are still raised.
+        with self.assertRaises(task_exceptions.TaskValidationException):
+            job.export_tasks(temp_dir=temp_dir, max_workers=2)
+
+    def test_taskGraphExportManifest(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+
+        job = task_graph.TaskGraph("taskGraphExportManifest")
+        t1 = TestSequence(name="Task1", dependencies=[], replacements={}, start_frame=1, end_frame=20, chunk_size=5)
+        t2 = TestTask_Successful(name="Task2", dependencies=["Task1"], replacements={})
+        job.add_tasks([t1, t2])
+
+        exported_tasks = job.export_tasks(temp_dir=temp_dir, use_manifest=True)
+        self.assertEqual(len(exported_tasks), 5)
+
+        # Every task, and every chunk, share a single manifest file.
+        self.assertEqual(len(os.listdir(temp_dir)), 1)
+        manifest_files = set(export.manifest_file for export in exported_tasks.values())
+        self.assertEqual(manifest_files, set([os.path.join(temp_dir, os.listdir(temp_dir)[0])]))
+
+        for full_name, export in exported_tasks.items():
+            self.assertIsNone(export.json_args_file)
+            self.assertIn("--manifest_record %s" % export.manifest_record, export.args)
 
+            record = JobManifest.read_record(export.manifest_file, export.manifest_record)
+            self.assertEqual(record["task_name"], export.task.__class__.__name__)
+            self.assertEqual(record["task_args"]["name"], export.task.name)
@@ -0,0 +1,140 @@
+from __future__ import print_function
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+import textwrap
+
+from unittest import mock
+
+from wolfkrow.core import tasks
+from wolfkrow.core.tasks import task_registry
+from wolfkrow.core.tasks.file_copy import FileCopy
+
+from .wolfkrow_testcase import WolfkrowTestCase
+
+PLUGIN_SOURCE = textwrap.dedent("""
+    from wolfkrow.core.tasks.file_copy import FileCopy as BaseFileCopy
+    from wolfkrow.core.tasks.task import Task
+
+
+    class CustomPluginTask(Task):
+        def run(self):
+            return True
+
+
+    class FileCopy(BaseFileCopy):
+        pass
+""")
+
+class TestTaskRegistry(WolfkrowTestCase):
+
+    def setUp(self):
+        super(TestTaskRegistry, self).setUp()
+
+        self.plugin_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.plugin_dir)
+        with open(os.path.join(self.plugin_dir, "custom_plugin_tasks.py"), "w") as handle:
+            handle.write(PLUGIN_SOURCE)
+
+        self.module_name = "wolfkrow.core.tasks.custom_plugin_tasks"
+        self.addCleanup(sys.modules.pop, self.module_name, None)
+
+        self.index_file = os.path.join(self.plugin_dir, "index", "task_index.json")
+        patcher = mock.patch.dict(os.environ, {
+            "WOLFKROW_TASK_SEARCH_PATHS": self.plugin_dir,
+            "WOLFKROW_TASK_INDEX_FILE": self.index_file,
+        })
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Use a fresh registry so the plugin does not leak into the other tests.
+        self.registry = tasks.TaskRegistry(tasks._find_task_modules)
+        patcher = mock.patch.object(tasks, "all_tasks", self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_lazy_loading(self):
+        manifest = self.registry.manifest
+        self.assertEqual(
+            manifest["CustomPluginTask"], 
+            os.path.join(self.plugin_dir, "custom_plugin_tasks.py")
+        )
+        self.assertIn("NukeRender", manifest)
+
+        # Scanning the modules does not import them.
+        self.assertNotIn(self.module_name, sys.modules)
+
+        task_class = self.registry.get("CustomPluginTask")
+        self.assertEqual(task_class.__name__, "CustomPluginTask")
+        self.assertEqual(task_class.__module__, self.module_name)
+        self.assertIn(self.module_name, sys.modules)
+
+        self.assertIsNone(self.registry.get("NotARealTask"))
+
+    def test_search_path_precedence(self):
+        # Tasks found in the search paths take precedence over the built in ones.
+        task_class = self.registry["FileCopy"]
+        self.assertEqual(task_class.__module__, self.module_name)
+        self.assertTrue(issubclass(task_class, FileCopy))
+
+        # Even if the built in module registers its Task afterwards.
+        self.registry["FileCopy"] = FileCopy
+        self.assertIs(self.registry["FileCopy"], task_class)
+
+        self.registry.load_all()
+        self.assertIs(self.registry["FileCopy"], task_class)
+
+    def test_search_path_precedence_after_import(self):
+        # The built in Task is registered before the override is ever looked up.
+        self.registry["FileCopy"] = FileCopy
+        from wolfkrow.core.tasks.file_copy import FileCopy as BuiltinFileCopy
+        self.assertIs(dict.get(self.registry, "FileCopy"), BuiltinFileCopy)
+
+        # Looking it up still loads the search path module which overrides it.
+        task_class = self.registry["FileCopy"]
+        self.assertEqual(task_class.__module__, self.module_name)
+        self.assertIs(self.registry.get("FileCopy"), task_class)
+        self.assertIn("FileCopy", self.registry)
+
+    def test_iteration_loads_all(self):
+        # NukeRender is already imported, so it will not register itself again.
+        from wolfkrow.core.tasks.nuke_render import NukeRender
+
+        self.assertIn("NukeRender", list(self.registry.keys()))
+        self.assertIn("CustomPluginTask", dict(self.registry.items()))
+
+    def test_task_index(self):
+        plugin_file = os.path.join(self.plugin_dir, "custom_plugin_tasks.py")
+
+        task_index = task_registry.TaskIndex(self.index_file)
+        results = dict(task_index.scan_directory(self.plugin_dir))
+        self.assertEqual(results[plugin_file], ["CustomPluginTask", "FileCopy"])
+        task_index.save()
+        self.assertTrue(os.path.exists(self.index_file))
+
+        # Unchanged files are not scanned again, even by a new process.
+        with mock.patch.object(task_registry, "scan_module_classes") as scan_module_classes:
+            task_index = task_registry.TaskIndex(self.index_file)
+            results = dict(task_index.scan_directory(self.plugin_dir))
+            self.assertFalse(scan_module_classes.called)
+        self.assertEqual(results[plugin_file], ["CustomPluginTask", "FileCopy"])
+
+        # Only the files which changed are scanned again.
+        new_file = os.path.join(self.plugin_dir, "more_plugin_tasks.py")
+        with open(new_file, "w") as handle:
+            handle.write("class AnotherPluginTask(object):\n    pass\n")
+
+        with mock.patch.object(
+            task_registry, "scan_module_classes", wraps=task_registry.scan_module_classes
+        ) as scan_module_classes:
+            task_index = task_registry.TaskIndex(self.index_file)
+            results = dict(task_index.scan_directory(self.plugin_dir))
+            scan_module_classes.assert_called_once_with(new_file)
+        self.assertEqual(results[new_file], ["AnotherPluginTask"])
+        self.assertEqual(results[plugin_file], ["CustomPluginTask", "FileCopy"])
+
+
+if __name__ == "__main__":
+    unittest.main()
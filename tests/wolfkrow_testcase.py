@@ -4,6 +4,9 @@ import os
 
 import shutil
 import stat
+import tempfile
+
+from unittest import mock
 
 from wolfkrow.builder import workflow_builder
 
@@ -16,6 +19,17 @@ class WolfkrowTestCase(unittest.TestCase):
         os.environ["TEST_ROOT"] = self._get_test_root()
         os.environ["WOLFKROW_DEFAULT_COMMAND_LINE_EXECUTABLE"] = "wolfkrow_run_task"
 
+        # Keep the caches wolfkrow writes to disk out of the home directory of 
+        # whoever runs the tests. Tests which exercise the caches override these.
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, True)
+        patcher = mock.patch.dict(os.environ, {
+            "WOLFKROW_TASK_INDEX_FILE": os.path.join(self.cache_dir, "task_index.json"),
+            "WOLFKROW_CONFIG_CACHE_DIR": os.path.join(self.cache_dir, "config"),
+        })
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def tearDown(self):
         def on_rm_error( func, path, exc_info):
             # path contains the path of the file that couldn't be removed